@@ -1,1093 +1,568 @@
-# a.py
-from flask import Flask, render_template_string, request, jsonify, send_from_directory
-from flask_cors import CORS
-import os
-import sys
-import threading
-import time
-from typing import Dict, Any
-import logging
-import traceback
-
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-from university_system import get_ultra_premium_system, initialize_ultra_premium_system, config
-
-app = Flask(__name__)
-app.config['SECRET_KEY'] = 'vit-ap-assistant-2025-ultra-secure'
-app.config['MAX_CONTENT_LENGTH'] = 200 * 1024 * 1024
-
-CORS(app, resources={r"/*": {"origins": "*"}})
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(name)s:%(lineno)d - %(message)s'
-)
-logger = logging.getLogger(__name__)
-
-class CampusQueryApp:
-    def __init__(self):
-        self.system = None
-        self.system_ready = False
-        self.initialization_status = "Starting system..."
-        self.document_count = 0
-        self.query_count = 0
-        self.successful_queries = 0
-        self.init_lock = threading.Lock()
-        
-        self.initialize_system()
-    
-    def initialize_system(self):
-        def init_thread():
-            try:
-                with self.init_lock:
-                    self.initialization_status = "Loading documents..."
-                    logger.info("Starting system initialization")
-                    
-                    success = initialize_ultra_premium_system(config.FORCE_REBUILD)
-                    
-                    if success:
-                        self.system = get_ultra_premium_system()
-                        self.document_count = len(self.system.documents)
-                        self.system_ready = True
-                        self.initialization_status = f"Ready! {self.document_count} documents loaded"
-                        logger.info(f"✓ System initialized with {self.document_count} documents")
-                    else:
-                        self.initialization_status = "Initialization failed"
-                        logger.error("System initialization failed")
-                        
-            except Exception as e:
-                self.initialization_status = f"Error: {str(e)}"
-                logger.error(f"Initialization error: {e}")
-                logger.error(traceback.format_exc())
-        
-        threading.Thread(target=init_thread, daemon=True).start()
-    
-    def get_status(self) -> Dict[str, Any]:
-        with self.init_lock:
-            actual_doc_count = self.document_count
-            if self.system and hasattr(self.system, 'documents'):
-                actual_doc_count = len(self.system.documents)
-            
-            return {
-                "ready": self.system_ready and actual_doc_count > 0,
-                "status": self.initialization_status,
-                "document_count": actual_doc_count,
-                "query_count": self.query_count,
-                "successful_queries": self.successful_queries,
-                "success_rate": (self.successful_queries / max(self.query_count, 1)) * 100
-            }
-    
-    def process_query(self, query: str) -> Dict[str, Any]:
-        if not self.system_ready or not self.system:
-            raise ValueError("System not ready. Please wait for initialization to complete.")
-        
-        start_time = time.time()
-        
-        try:
-            result = self.system.process_query_ultra_premium(query)
-            self.query_count += 1
-            self.successful_queries += 1
-            
-            response_time = time.time() - start_time
-            
-            response_data = {
-                "answer": result.answer,
-                "justification": result.justification,
-                "key_points": result.key_points,
-                "document_references": result.document_references,
-                "sources": result.sources,
-                "applicable_sections": result.applicable_sections,
-                "query": query,
-                "confidence_score": result.confidence_score,
-                "quality_score": result.quality_score,
-                "follow_up_questions": result.follow_up_questions,
-                "processing_time": response_time
-            }
-            
-            logger.info(f"✓ Query processed: '{query[:50]}...' ({response_time:.2f}s)")
-            return response_data
-            
-        except Exception as e:
-            self.query_count += 1
-            logger.error(f"Query processing error: {e}")
-            logger.error(traceback.format_exc())
-            raise
-
-campus_app = CampusQueryApp()
-
-# Complete working HTML
-COMPLETE_HTML = '''
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>VIT-AP University Assistant</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }
-        
-        .container { max-width: 1400px; margin: 0 auto; }
-        
-        .header {
-            background: white;
-            border-radius: 16px;
-            padding: 30px;
-            margin-bottom: 20px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-        }
-        
-        .header h1 {
-            color: #2563eb;
-            font-size: 2.5rem;
-            margin-bottom: 10px;
-            display: flex;
-            align-items: center;
-            gap: 15px;
-        }
-        
-        .header-subtitle { color: #6b7280; font-size: 1.1rem; }
-        
-        .status-box {
-            background: #f0f9ff;
-            padding: 20px;
-            border-radius: 12px;
-            border-left: 5px solid #2563eb;
-            margin-top: 20px;
-        }
-        
-        .status-indicator {
-            display: inline-block;
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            background: #dc2626;
-            margin-right: 10px;
-            animation: pulse 2s infinite;
-        }
-        
-        .status-indicator.ready {
-            background: #16a34a;
-            animation: none;
-        }
-        
-        @keyframes pulse {
-            0%, 100% { opacity: 1; }
-            50% { opacity: 0.5; }
-        }
-        
-        .main-content {
-            display: grid;
-            grid-template-columns: 2fr 1fr;
-            gap: 20px;
-            margin-bottom: 20px;
-        }
-        
-        .panel {
-            background: white;
-            border-radius: 16px;
-            padding: 30px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-        }
-        
-        .panel h3 {
-            color: #1f2937;
-            margin-bottom: 20px;
-            font-size: 1.5rem;
-        }
-        
-        .query-input {
-            width: 100%;
-            min-height: 150px;
-            padding: 15px;
-            border: 2px solid #e5e7eb;
-            border-radius: 12px;
-            font-size: 16px;
-            resize: vertical;
-            font-family: inherit;
-            transition: border-color 0.3s;
-        }
-        
-        .query-input:focus {
-            outline: none;
-            border-color: #2563eb;
-            box-shadow: 0 0 0 3px rgba(37, 99, 235, 0.1);
-        }
-        
-        .btn {
-            background: #2563eb;
-            color: white;
-            padding: 14px 28px;
-            border: none;
-            border-radius: 10px;
-            font-size: 16px;
-            font-weight: 600;
-            cursor: pointer;
-            margin-top: 15px;
-            margin-right: 10px;
-            transition: all 0.3s;
-        }
-        
-        .btn:hover:not(:disabled) {
-            background: #1e40af;
-            transform: translateY(-2px);
-            box-shadow: 0 5px 15px rgba(37, 99, 235, 0.3);
-        }
-        
-        .btn:disabled {
-            background: #9ca3af;
-            cursor: not-allowed;
-            transform: none;
-        }
-        
-        .btn-secondary {
-            background: #6b7280;
-        }
-        
-        .btn-secondary:hover {
-            background: #4b5563;
-        }
-        
-        .sample-btn {
-            display: block;
-            width: 100%;
-            text-align: left;
-            background: #f9fafb;
-            color: #374151;
-            padding: 15px;
-            margin: 10px 0;
-            border: 2px solid #e5e7eb;
-            border-radius: 10px;
-            cursor: pointer;
-            font-size: 14px;
-            transition: all 0.3s;
-        }
-        
-        .sample-btn:hover {
-            background: #2563eb;
-            color: white;
-            border-color: #2563eb;
-            transform: translateX(8px);
-        }
-        
-        .result-container {
-            background: white;
-            border-radius: 16px;
-            padding: 40px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-            display: none;
-            animation: slideIn 0.5s ease-out;
-        }
-        
-        @keyframes slideIn {
-            from { opacity: 0; transform: translateY(20px); }
-            to { opacity: 1; transform: translateY(0); }
-        }
-        
-        .result-header {
-            border-bottom: 3px solid #e5e7eb;
-            padding-bottom: 20px;
-            margin-bottom: 30px;
-        }
-        
-        .result-title {
-            color: #2563eb;
-            font-size: 2rem;
-            margin-bottom: 15px;
-        }
-        
-        .metrics {
-            display: flex;
-            gap: 30px;
-            flex-wrap: wrap;
-        }
-        
-        .metric {
-            display: flex;
-            align-items: center;
-            gap: 8px;
-            color: #6b7280;
-            font-size: 14px;
-        }
-        
-        .metric strong {
-            color: #1f2937;
-        }
-        
-        .answer-content {
-            line-height: 1.9;
-            color: #374151;
-            margin-bottom: 30px;
-            white-space: pre-wrap;
-            font-size: 1.1rem;
-        }
-        
-        .key-points {
-            background: #eff6ff;
-            padding: 25px;
-            border-radius: 12px;
-            margin-bottom: 30px;
-        }
-        
-        .key-points h3 {
-            color: #1e40af;
-            margin-bottom: 15px;
-        }
-        
-        .key-points ul {
-            list-style: none;
-        }
-        
-        .key-points li {
-            padding: 10px 0;
-            padding-left: 30px;
-            position: relative;
-            color: #374151;
-        }
-        
-        .key-points li:before {
-            content: "✓";
-            position: absolute;
-            left: 0;
-            color: #2563eb;
-            font-weight: bold;
-            font-size: 1.2rem;
-        }
-        
-        .sources-section {
-            background: #f9fafb;
-            padding: 30px;
-            border-radius: 12px;
-            margin-top: 30px;
-        }
-        
-        .sources-section h3 {
-            color: #1f2937;
-            margin-bottom: 20px;
-        }
-        
-        .source-card {
-            background: white;
-            padding: 20px;
-            border-radius: 10px;
-            margin: 15px 0;
-            border-left: 5px solid #2563eb;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-            transition: transform 0.3s;
-        }
-        
-        .source-card:hover {
-            transform: translateX(5px);
-        }
-        
-        .source-card-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: start;
-            margin-bottom: 15px;
-        }
-        
-        .source-filename {
-            font-weight: bold;
-            color: #1f2937;
-            font-size: 1.1rem;
-        }
-        
-        .view-pdf-btn {
-            background: #2563eb;
-            color: white;
-            border: none;
-            padding: 8px 16px;
-            border-radius: 6px;
-            cursor: pointer;
-            font-size: 13px;
-            transition: background 0.3s;
-        }
-        
-        .view-pdf-btn:hover {
-            background: #1e40af;
-        }
-        
-        .citation-box {
-            background: #fef3c7;
-            border: 2px solid #fbbf24;
-            border-radius: 8px;
-            padding: 15px;
-            margin-top: 10px;
-            font-size: 14px;
-            color: #92400e;
-        }
-        
-        .citation-label {
-            font-weight: bold;
-            color: #78350f;
-            margin-bottom: 5px;
-        }
-        
-        .followup-section {
-            margin-top: 30px;
-        }
-        
-        .followup-section h3 {
-            color: #1f2937;
-            margin-bottom: 15px;
-        }
-        
-        .followup-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 15px;
-        }
-        
-        .followup-btn {
-            background: linear-gradient(135deg, #eff6ff 0%, #dbeafe 100%);
-            border: 2px solid #bfdbfe;
-            color: #1e40af;
-            padding: 15px;
-            border-radius: 10px;
-            cursor: pointer;
-            text-align: left;
-            transition: all 0.3s;
-            font-size: 14px;
-        }
-        
-        .followup-btn:hover {
-            background: linear-gradient(135deg, #dbeafe 0%, #bfdbfe 100%);
-            border-color: #2563eb;
-            transform: scale(1.02);
-        }
-        
-        .loading {
-            text-align: center;
-            padding: 60px;
-            color: #6b7280;
-        }
-        
-        .spinner {
-            border: 4px solid #f3f4f6;
-            border-top: 4px solid #2563eb;
-            border-radius: 50%;
-            width: 50px;
-            height: 50px;
-            animation: spin 1s linear infinite;
-            margin: 0 auto 20px;
-        }
-        
-        @keyframes spin {
-            0% { transform: rotate(0deg); }
-            100% { transform: rotate(360deg); }
-        }
-        
-        .error-box {
-            background: #fee2e2;
-            border-left: 5px solid #dc2626;
-            padding: 20px;
-            border-radius: 10px;
-            color: #991b1b;
-        }
-        
-        .error-box strong {
-            display: block;
-            margin-bottom: 10px;
-            font-size: 1.1rem;
-        }
-        
-        .modal {
-            display: none;
-            position: fixed;
-            inset: 0;
-            background: rgba(0, 0, 0, 0.8);
-            z-index: 1000;
-            padding: 20px;
-            animation: fadeIn 0.3s;
-        }
-        
-        @keyframes fadeIn {
-            from { opacity: 0; }
-            to { opacity: 1; }
-        }
-        
-        .modal-content {
-            background: white;
-            border-radius: 16px;
-            max-width: 1200px;
-            max-height: 90vh;
-            margin: auto;
-            display: flex;
-            flex-direction: column;
-            position: relative;
-            top: 50%;
-            transform: translateY(-50%);
-        }
-        
-        .modal-header {
-            padding: 25px;
-            border-bottom: 2px solid #e5e7eb;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        
-        .modal-title {
-            font-size: 1.5rem;
-            color: #1f2937;
-            font-weight: bold;
-        }
-        
-        .close-btn {
-            background: none;
-            border: none;
-            font-size: 2rem;
-            color: #6b7280;
-            cursor: pointer;
-            padding: 0;
-            width: 40px;
-            height: 40px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            border-radius: 8px;
-            transition: all 0.3s;
-        }
-        
-        .close-btn:hover {
-            background: #f3f4f6;
-            color: #1f2937;
-        }
-        
-        .modal-body {
-            padding: 25px;
-            overflow-y: auto;
-            flex: 1;
-        }
-        
-        .highlight-box {
-            background: #fef3c7;
-            border: 3px solid #fbbf24;
-            border-radius: 10px;
-            padding: 20px;
-            margin-bottom: 20px;
-        }
-        
-        .highlight-box h4 {
-            color: #78350f;
-            margin-bottom: 10px;
-        }
-        
-        .pdf-preview {
-            background: #f3f4f6;
-            padding: 40px;
-            border-radius: 10px;
-            text-align: center;
-            min-height: 300px;
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            justify-content: center;
-        }
-        
-        .pdf-icon {
-            width: 80px;
-            height: 80px;
-            margin-bottom: 20px;
-            color: #6b7280;
-        }
-        
-        .open-pdf-btn {
-            background: #2563eb;
-            color: white;
-            padding: 12px 24px;
-            border: none;
-            border-radius: 8px;
-            font-size: 16px;
-            cursor: pointer;
-            margin-top: 20px;
-            text-decoration: none;
-            display: inline-block;
-            transition: background 0.3s;
-        }
-        
-        .open-pdf-btn:hover {
-            background: #1e40af;
-        }
-        
-        @media (max-width: 768px) {
-            .main-content {
-                grid-template-columns: 1fr;
-            }
-            
-            .metrics {
-                flex-direction: column;
-                gap: 15px;
-            }
-            
-            .followup-grid {
-                grid-template-columns: 1fr;
-            }
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>
-                <span style="font-size: 2.5rem;">🎓</span>
-                VIT-AP University Assistant
-            </h1>
-            <p class="header-subtitle">Ultra-Premium AI-Powered Information System with Source Citations</p>
-            
-            <div class="status-box">
-                <div style="display: flex; align-items: center; margin-bottom: 15px;">
-                    <span class="status-indicator" id="statusIndicator"></span>
-                    <span id="statusText" style="font-weight: 600; font-size: 1.1rem;">Initializing system...</span>
-                </div>
-                <div class="metrics">
-                    <div class="metric">
-                        <span>📄</span>
-                        <span>Documents: <strong id="docCount">0</strong></span>
-                    </div>
-                    <div class="metric">
-                        <span>💬</span>
-                        <span>Queries: <strong id="queryCount">0</strong></span>
-                    </div>
-                    <div class="metric">
-                        <span>📈</span>
-                        <span>Success Rate: <strong id="successRate">0%</strong></span>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <div class="main-content">
-            <div class="panel">
-                <h3>🔍 Ask Your Question</h3>
-                
-                <textarea 
-                    id="queryInput" 
-                    class="query-input" 
-                    placeholder="Ask anything about VIT-AP University...
-
-Examples:
-- What are the admission requirements?
-- What programs are offered at VIT-AP?
-- What is the fee structure?
-- What facilities are available on campus?
-- Tell me about hostel accommodation
-- What scholarships are available?"
-                ></textarea>
-                
-                <button id="askBtn" class="btn" onclick="processQuery()" disabled>
-                    Ask Question
-                </button>
-                <button class="btn btn-secondary" onclick="clearQuery()">
-                    Clear
-                </button>
-            </div>
-            
-            <div class="panel">
-                <h3>📚 Sample Questions</h3>
-                <button class="sample-btn" onclick="askSampleQuestion(this.textContent.trim())">What are the admission requirements for VIT-AP?</button>
-                <button class="sample-btn" onclick="askSampleQuestion(this.textContent.trim())">What undergraduate programs are offered?</button>
-                <button class="sample-btn" onclick="askSampleQuestion(this.textContent.trim())">What is the fee structure for B.Tech programs?</button>
-                <button class="sample-btn" onclick="askSampleQuestion(this.textContent.trim())">What facilities are available on campus?</button>
-                <button class="sample-btn" onclick="askSampleQuestion(this.textContent.trim())">Tell me about hostel facilities and accommodation</button>
-                <button class="sample-btn" onclick="askSampleQuestion(this.textContent.trim())">What scholarship opportunities are available?</button>
-            </div>
-        </div>
-        
-        <div id="resultContainer" class="result-container"></div>
-    </div>
-    
-    <div id="pdfModal" class="modal">
-        <div class="modal-content">
-            <div class="modal-header">
-                <h2 class="modal-title" id="modalTitle">Document Viewer</h2>
-                <button class="close-btn" onclick="closePDFModal()">×</button>
-            </div>
-            <div class="modal-body" id="modalBody">
-                </div>
-        </div>
-    </div>
-    
-    <script>
-        let systemReady = false;
-        let statusCheckCount = 0;
-        let statusCheckInterval = null;
-        
-        // Check system status
-        function checkStatus() {
-            console.log('[Status Check]', statusCheckCount);
-            
-            fetch('/api/status')
-                .then(r => {
-                    if (!r.ok) throw new Error(`HTTP ${r.status}`);
-                    return r.json();
-                })
-                .then(data => {
-                    console.log('[Status Response]', data);
-                    
-                    document.getElementById('statusText').textContent = data.status;
-                    document.getElementById('docCount').textContent = data.document_count || 0;
-                    document.getElementById('queryCount').textContent = data.query_count || 0;
-                    document.getElementById('successRate').textContent = (data.success_rate || 0).toFixed(1) + '%';
-                    
-                    const indicator = document.getElementById('statusIndicator');
-                    const askBtn = document.getElementById('askBtn');
-                    
-                    // Check if ready
-                    if (data.ready && data.document_count > 0) {
-                        systemReady = true;
-                        indicator.classList.add('ready');
-                        askBtn.disabled = false;
-                        console.log('✓ SYSTEM READY - Button enabled!');
-                        
-                        // Stop checking
-                        if (statusCheckInterval) {
-                            clearInterval(statusCheckInterval);
-                            statusCheckInterval = null;
-                        }
-                    } else {
-                        systemReady = false;
-                        indicator.classList.remove('ready');
-                        askBtn.disabled = true;
-                        console.log('System not ready, will retry...');
-                    }
-                })
-                .catch(error => {
-                    console.error('[Status Error]', error);
-                });
-        }
-        
-        function askSampleQuestion(text) {
-            document.getElementById('queryInput').value = text;
-            processQuery();
-        }
-        
-        function clearQuery() {
-            document.getElementById('queryInput').value = '';
-            const result = document.getElementById('resultContainer');
-            if (result) result.style.display = 'none';
-        }
-        
-        function processQuery() {
-            if (!systemReady) {
-                alert('⏳ System is still initializing. Please wait a moment...');
-                return;
-            }
-            
-            const query = document.getElementById('queryInput').value.trim();
-            if (!query) {
-                alert('Please enter a question');
-                return;
-            }
-            
-            const askBtn = document.getElementById('askBtn');
-            const resultContainer = document.getElementById('resultContainer');
-            
-            askBtn.disabled = true;
-            askBtn.textContent = 'Processing...';
-            
-            resultContainer.innerHTML = '<div class="loading"><div class="spinner"></div><p style="font-size: 1.2rem;">Analyzing your question with AI...</p></div>';
-            resultContainer.style.display = 'block';
-            
-            // Scroll to results
-            resultContainer.scrollIntoView({ behavior: 'smooth' });
-            
-            console.log('[Query] Sending:', query);
-            
-            fetch('/api/query', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ query: query })
-            })
-            .then(r => {
-                if (!r.ok) throw new Error(`HTTP ${r.status}`);
-                return r.json();
-            })
-            .then(data => {
-                console.log('[Answer] Received');
-                if (data.error) {
-                    showError(data.error);
-                } else {
-                    displayResults(data);
-                }
-                checkStatus(); // Refresh status
-            })
-            .catch(error => {
-                console.error('[Query Error]', error);
-                showError('Network error: ' + error.message);
-            })
-            .finally(() => {
-                askBtn.disabled = !systemReady;
-                askBtn.textContent = 'Ask Question';
-            });
-        }
-        
-        function displayResults(data) {
-            let html = `
-                <div class="result-header">
-                    <h2 class="result-title">Answer</h2>
-                    <div class="metrics">
-                        <div class="metric">
-                            <span style="color: #16a34a;">✓</span>
-                            <span>Confidence: <strong>${(data.confidence_score * 100).toFixed(1)}%</strong></span>
-                        </div>
-                        <div class="metric">
-                            <span style="color: #2563eb;">📊</span>
-                            <span>Quality: <strong>${(data.quality_score * 100).toFixed(1)}%</strong></span>
-                        </div>
-                        <div class="metric">
-                            <span style="color: #7c3aed;">⏱️</span>
-                            <span>Time: <strong>${data.processing_time.toFixed(2)}s</strong></span>
-                        </div>
-                    </div>
-                </div>
-
-                <div class="answer-content">${escapeHtml(data.answer).replace(/\n/g, '<br>')}</div>
-            `;
-
-            if (data.key_points && data.key_points.length > 0) {
-                html += '<div class="key-points"><h3>📌 Key Points</h3><ul>';
-                data.key_points.forEach(point => {
-                    html += `<li>${escapeHtml(point)}</li>`;
-                });
-                html += '</ul></div>';
-            }
-
-            if (data.sources && data.sources.length > 0) {
-                html += '<div class="sources-section">';
-                html += `<h3>📄 Sources & Citations (${data.sources.length})</h3>`;
-                data.sources.forEach((source, i) => {
-                    const sourceJSON = JSON.stringify(source).replace(/'/g, '&#39;');
-                    html += `
-                        <div class="source-card">
-                            <div class="source-card-header">
-                                <div class="source-filename">${escapeHtml(source.filename)}</div>
-                                <button class="view-pdf-btn" onclick='openPDFViewer(${sourceJSON})'>
-                                    🔍 View PDF
-                                </button>
-                            </div>
-                            <div style="color: #6b7280; font-size: 14px; margin-bottom: 10px;">
-                                Relevance: <strong style="color: #2563eb;">${(source.relevance_score * 100).toFixed(0)}%</strong>
-                                ${source.page_number ? ` | Page: ${source.page_number}` : ''}
-                            </div>
-                            <div class="citation-box">
-                                <div class="citation-label">📌 Citation from document:</div>
-                                <div>${escapeHtml(source.content_preview.substring(0, 400))}...</div>
-                            </div>
-                        </div>
-                    `;
-                });
-                html += '</div>';
-            }
-
-            if (data.follow_up_questions && data.follow_up_questions.length > 0) {
-                html += '<div class="followup-section">';
-                html += '<h3>💡 Related Questions</h3>';
-                html += '<div class="followup-grid">';
-                data.follow_up_questions.forEach(q => {
-                    const escaped = escapeHtml(q).replace(/'/g, '&#39;');
-                    html += `<button class="followup-btn" onclick="document.getElementById('queryInput').value='${escaped}'; processQuery();">${escapeHtml(q)}</button>`;
-                });
-                html += '</div></div>';
-            }
-
-            document.getElementById('resultContainer').innerHTML = html;
-        }
-        
-        function showError(error) {
-            document.getElementById('resultContainer').innerHTML = `
-                <div class="error-box">
-                    <strong>❌ Error</strong>
-                    <div>${escapeHtml(error)}</div>
-                </div>
-            `;
-        }
-        
-        function openPDFViewer(source) {
-            document.getElementById('modalTitle').textContent = source.filename;
-            document.getElementById('modalBody').innerHTML = `
-                <div class="highlight-box">
-                    <h4>📌 Highlighted Citation:</h4>
-                    <p>${escapeHtml(source.content_preview)}</p>
-                </div>
-                <div class="pdf-preview">
-                    <svg class="pdf-icon" viewBox="0 0 24 24" fill="none" stroke="currentColor">
-                        <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z" />
-                    </svg>
-                    <p style="color: #6b7280; font-size: 1.1rem;">PDF Document: <strong>${escapeHtml(source.filename)}</strong></p>
-                    <p style="color: #9ca3af; margin-top: 10px;">The citation above shows the exact text used for this answer</p>
-                    <a href="/docs/${encodeURIComponent(source.filename)}" target="_blank" class="open-pdf-btn">
-                        📄 Open Full PDF in New Tab
-                    </a>
-                </div>
-            `;
-            document.getElementById('pdfModal').style.display = 'block';
-        }
-        
-        function closePDFModal() {
-            document.getElementById('pdfModal').style.display = 'none';
-        }
-        
-        function escapeHtml(text) {
-            const div = document.createElement('div');
-            div.textContent = text;
-            return div.innerHTML;
-        }
-        
-        // Close modal on outside click
-        window.onclick = function(event) {
-            const modal = document.getElementById('pdfModal');
-            if (event.target === modal) {
-                closePDFModal();
-            }
-        }
-        
-        // Keyboard shortcuts
-        document.getElementById('queryInput').addEventListener('keydown', function(e) {
-            if (e.key === 'Enter' && (e.ctrlKey || e.metaKey)) {
-                processQuery();
-            }
-        });
-        
-        document.addEventListener('keydown', function(e) {
-            if (e.key === 'Escape') {
-                closePDFModal();
-            }
-        });
-        
-        // Initialize - check status immediately and repeatedly
-        console.log('=== VIT-AP Assistant Interface Loaded ===');
-        checkStatus();
-        
-        // Set up interval to check every 2 seconds until ready
-        statusCheckInterval = setInterval(function() {
-            if (!systemReady) {
-                statusCheckCount++;
-                checkStatus();
-                if (statusCheckCount > 60) {
-                    clearInterval(statusCheckInterval);
-                    console.error('Status check timeout');
-                }
-            }
-        }, 2000);
-    </script>
-</body>
-</html>
-'''
-
-@app.route('/')
-def home():
-    return render_template_string(COMPLETE_HTML)
-
-@app.route('/api/status')
-def api_status():
-    try:
-        status = campus_app.get_status()
-        logger.info(f"Status request: ready={status['ready']}, docs={status['document_count']}")
-        return jsonify(status)
-    except Exception as e:
-        logger.error(f"Status error: {e}")
-        return jsonify({
-            "ready": False, 
-            "status": f"Error: {str(e)}", 
-            "document_count": 0,
-            "query_count": 0,
-            "successful_queries": 0,
-            "success_rate": 0
-        }), 500
-
-@app.route('/api/query', methods=['POST'])
-def api_query():
-    try:
-        data = request.get_json()
-        if not data or 'query' not in data:
-            return jsonify({"error": "No query provided"}), 400
-        
-        query = data['query'].strip()
-        if not query:
-            return jsonify({"error": "Empty query"}), 400
-        
-        if not campus_app.system_ready:
-            return jsonify({"error": "System is still initializing. Please wait..."}), 503
-        
-        result = campus_app.process_query(query)
-        return jsonify(result)
-        
-    except Exception as e:
-        logger.error(f"Query API error: {e}")
-        logger.error(traceback.format_exc())
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/docs/<path:filename>')
-def serve_document(filename):
-    try:
-        if '..' in filename or filename.startswith('/'):
-            return "Invalid filename", 404
-        
-        docs_dir = os.path.abspath(config.UNIVERSITY_DOCS_DIR)
-        file_path = os.path.join(docs_dir, filename)
-        
-        if not os.path.isfile(file_path) or not file_path.startswith(docs_dir):
-            return "File not found", 404
-        
-        return send_from_directory(docs_dir, filename)
-    except Exception as e:
-        logger.error(f"Document serve error: {e}")
-        return "Error serving document", 404
-
-@app.route('/favicon.ico')
-def favicon():
-    return '', 204
-
-@app.errorhandler(404)
-def not_found(error):
-    return jsonify({'error': 'Endpoint not found'}), 404
-
-@app.errorhandler(500)
-def internal_error(error):
-    logger.error(f"Internal error: {error}")
-    return jsonify({'error': 'Internal server error'}), 500
-
-if __name__ == '__main__':
-    os.makedirs(config.UNIVERSITY_DOCS_DIR, exist_ok=True)
-    os.makedirs('./persistent_data', exist_ok=True)
-    
-    print("=" * 80)
-    print("🎓 VIT-AP UNIVERSITY ASSISTANT - ULTRA-PREMIUM SYSTEM")
-    print("=" * 80)
-    print(f"📁 Documents Directory: {config.UNIVERSITY_DOCS_DIR}")
-    print(f"🌐 Server URL: http://localhost:5000")
-    print(f"🔑 API Keys Configured: {len(config.GEMINI_API_KEYS)}")
-    print("=" * 80)
-    
-    if os.path.exists(config.UNIVERSITY_DOCS_DIR):
-        files = [f for f in os.listdir(config.UNIVERSITY_DOCS_DIR) 
-                if f.endswith(('.pdf', '.docx', '.txt'))]
-        print(f"📚 Found {len(files)} documents")
-        if files:
-            print(f"📄 Sample files: {', '.join(files[:3])}")
-            if len(files) > 3:
-                print(f"   ... and {len(files) - 3} more")
-    
-    print("=" * 80)
-    print("🚀 Starting Flask server...")
-    print("💡 Open http://localhost:5000 in your browser")
-    print("   Wait 5-10 seconds for system initialization")
-    print("   Watch for 'System Ready!' status before asking questions")
-    print("=" * 80)
-    
-    app.run(
-        debug=False,
-        host='0.0.0.0',
-        port=5000,
-        threaded=True,
-        use_reloader=False
+# a.py
+from flask import Flask, request, jsonify, render_template
+import gzip
+import hashlib
+import os
+import shelve
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows: one worker there, nothing to serialize
+    fcntl = None
+
+# Request threads already run queries in parallel; one BLAS/OpenMP thread
+# per call avoids oversubscribing the CPU. Must be set before numpy/faiss load.
+for _var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+    os.environ.setdefault(_var, '1')
+os.environ.setdefault('OMP_WAIT_POLICY', 'PASSIVE')
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from query_cache import QueryCache
+from compression import use_gzip
+from cors import use_cors
+from json_provider import use_orjson
+from log_queue import use_queue_logging
+from doc_routes import document_blueprint
+
+app = Flask(__name__)
+app.config['SECRET_KEY'] = 'vit-ap-assistant-2025-ultra-secure'
+app.config['MAX_CONTENT_LENGTH'] = 200 * 1024 * 1024
+use_orjson(app)
+use_gzip(app)
+
+use_cors(app, prefixes=('/api/', '/docs/', '/static/'))
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s:%(lineno)d - %(message)s'
+)
+use_queue_logging()
+logger = logging.getLogger(__name__)
+
+# /api/status averages the response time over this many recent queries
+RECENT_TIMES = 256
+
+# Finished jobs whose results are never collected are dropped past this
+MAX_TRACKED_JOBS = 256
+
+# Pipeline result attributes copied into every query response
+RESULT_FIELDS = (
+    "answer", "justification", "key_points", "document_references",
+    "applicable_sections", "confidence_score", "quality_score", "follow_up_questions",
+)
+# The page never shows more of a source's preview than this
+PREVIEW_CHARS = 400
+
+def is_fallback(response_data: Dict[str, Any]) -> bool:
+    """university_system answers errors and "nothing found" with zero
+    confidence; those are not worth keeping."""
+    return not response_data.get("confidence_score")
+
+# Cache lifetime of the content-hashed static URLs the page links to
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+# Seconds a client is told to wait before retrying a query during startup
+NOT_READY_RETRY_AFTER = '5'
+
+# How long a status long-poll waits for a change before answering anyway
+STATUS_WAIT_SECONDS = 25
+# Long-polls held at once. Each holds a request thread (gunicorn.conf.py
+# gives a worker 8), so open tabs can't starve queries, /docs and static files;
+# past this a poll is answered at once and told to come back later
+MAX_STATUS_WAITERS = 2
+STATUS_RETRY_AFTER = '3'
+
+# How long a duplicate query waits on the identical one already running
+INFLIGHT_WAIT = 60
+
+# When this process started, and the shelf key recording when its sample
+# answers were reset, so FORCE_REBUILD clears them once per deployment start
+STARTED_AT = time.time()
+SHELF_WRITTEN_AT = '__written_at__'
+
+# Shown on the home page; answered once after init so the first click is a cache hit
+SAMPLE_QUESTIONS = (
+    "What are the admission requirements for VIT-AP?",
+    "What undergraduate programs are offered?",
+    "What is the fee structure for B.Tech programs?",
+    "What facilities are available on campus?",
+    "Tell me about hostel facilities and accommodation",
+    "What scholarship opportunities are available?",
+)
+
+
+def system_config():
+    """university_system's config. Importing university_system loads the whole
+    ML stack, so it happens in the init thread rather than at module import;
+    after that this is just a sys.modules lookup."""
+    from university_system import config
+    return config
+
+class CampusQueryApp:
+    def __init__(self):
+        self.system = None
+        self.ready_event = threading.Event()
+        # Bumped on every status change; long-polling clients wait on it
+        self.status_changed = threading.Condition()
+        self.status_waiters = threading.BoundedSemaphore(MAX_STATUS_WAITERS)
+        self.status_version = 0
+        # False once initialization has finished, ready or not; the status
+        # won't change after that, so long-polls stop waiting for it
+        self.initializing = True
+        self.initialization_status = "Starting system..."
+        self.document_count = 0
+        self.query_count = 0
+        self.successful_queries = 0
+        self.init_lock = threading.Lock()
+        # Only writers take this; readers see whole ints without locking
+        self.stats_lock = threading.Lock()
+        # deque.append is atomic, so timings are recorded without the lock and
+        # only averaged when someone asks for the status
+        self.recent_times: "deque[float]" = deque(maxlen=RECENT_TIMES)
+        self.query_cache = QueryCache(maxsize=512)
+        self.query_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='query')
+        self.jobs: "OrderedDict[str, Future]" = OrderedDict()
+        self.jobs_lock = threading.Lock()
+        # Normalized query -> Future of the pipeline run currently answering it
+        self.inflight: Dict[str, Future] = {}
+        self.inflight_lock = threading.Lock()
+        
+        self.initialize_system()
+    
+    @property
+    def system_ready(self) -> bool:
+        return self.ready_event.is_set()
+    
+    @property
+    def initialization_status(self) -> str:
+        return self._initialization_status
+    
+    @initialization_status.setter
+    def initialization_status(self, value: str):
+        with self.status_changed:
+            self._initialization_status = value
+            self.status_version += 1
+            self.status_changed.notify_all()
+    
+    def wait_for_status_change(self, version: int, timeout: float) -> bool:
+        """Block until the status moves past ``version`` or ``timeout`` elapses.
+        Returns False without waiting when MAX_STATUS_WAITERS already are."""
+        if not self.status_waiters.acquire(blocking=False):
+            return False
+        try:
+            with self.status_changed:
+                self.status_changed.wait_for(lambda: self.status_version != version, timeout)
+        finally:
+            self.status_waiters.release()
+        return True
+    
+    def _record_query(self, success: bool, seconds: float):
+        self.recent_times.append(seconds)
+        with self.stats_lock:
+            self.query_count += 1
+            if success:
+                self.successful_queries += 1
+    
+    def initialize_system(self):
+        def init_thread():
+            try:
+                with self.init_lock:
+                    self.initialization_status = "Loading documents..."
+                    logger.info("Starting system initialization")
+                    
+                    from university_system import get_ultra_premium_system, initialize_ultra_premium_system
+                    success = initialize_ultra_premium_system(system_config().FORCE_REBUILD)
+                    
+                    if success:
+                        self.system = get_ultra_premium_system()
+                        self._enable_semantic_cache()
+                        self.document_count = len(self.system.documents)
+                        self.ready_event.set()
+                        self.initialization_status = f"Ready! {self.document_count} documents loaded"
+                        logger.info(f"✓ System initialized with {self.document_count} documents")
+                    else:
+                        self.initialization_status = "Initialization failed"
+                        logger.error("System initialization failed")
+                
+                if self.system_ready:
+                    self._warm_sample_questions()
+                        
+            except Exception as e:
+                self.initialization_status = f"Error: {str(e)}"
+                logger.exception("Initialization error")
+            finally:
+                self.initializing = False
+        
+        threading.Thread(target=init_thread, daemon=True).start()
+    
+    def _enable_semantic_cache(self):
+        """Let reworded questions hit the cache when the system can embed a
+        query; otherwise it stays exact-match. Nothing has been cached yet,
+        so the cache is simply replaced."""
+        embed_query = getattr(self.system, 'embed_query', None)
+        if embed_query is None:
+            return
+        import faiss
+        import numpy as np
+        
+        def embed_fn(query: str):
+            # university_system doesn't promise the shape QueryCache needs:
+            # a C-contiguous, L2-normalised float32 array of shape (1, d)
+            vector = np.array(embed_query(query), dtype='float32').reshape(1, -1)
+            faiss.normalize_L2(vector)
+            return vector
+        
+        try:
+            embed_fn(SAMPLE_QUESTIONS[0])
+        except Exception as e:
+            logger.warning("Query embedding unusable, cache stays exact-match: %s", e)
+            return
+        config = system_config()
+        self.query_cache = QueryCache(
+            maxsize=512, embed_fn=embed_fn,
+            threshold=getattr(config, 'SEMANTIC_CACHE_THRESHOLD', 0.97),
+            ttl=getattr(config, 'QUERY_CACHE_TTL', 24 * 3600)
+        )
+    
+    def _warm_sample_questions(self):
+        """Prime the query cache with the sample questions' answers and query
+        vectors, reusing the ones saved by a previous run unless the index was
+        rebuilt. Workers take turns on the shelf, which allows one writer;
+        after the first, they only read what it saved. Saved answers keep
+        their original timestamp and are dropped once older than the TTL."""
+        config = system_config()
+        ttl = getattr(config, 'QUERY_CACHE_TTL', 24 * 3600)
+        cache_dir = getattr(config, 'CACHE_DIR', './api_cache')
+        os.makedirs(cache_dir, exist_ok=True)
+        shelf_path = os.path.join(cache_dir, 'sample_answers')
+        with open(shelf_path + '.lock', 'a') as lock_file:
+            if fcntl is not None:
+                # Released when the lock file is closed
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            with shelve.open(shelf_path) as saved:
+                # Cleared once per start, not by each worker in turn
+                if config.FORCE_REBUILD and saved.get(SHELF_WRITTEN_AT, 0) < STARTED_AT:
+                    saved.clear()
+                    saved[SHELF_WRITTEN_AT] = time.time()
+                for question in SAMPLE_QUESTIONS:
+                    key = QueryCache.normalize(question)
+                    if key in saved:
+                        entry = saved[key]
+                        # Entries from before timestamps were saved count as expired
+                        if len(entry) == 3 and time.time() - entry[2] <= ttl:
+                            response_data, vector, stored_at = entry
+                            self.query_cache.store(question, response_data, vector,
+                                                   stored_at=stored_at)
+                            continue
+                        del saved[key]
+                    try:
+                        # Embeds the question when the semantic tier is on
+                        _, vector = self.query_cache.lookup(question)
+                        stored_at = time.time()
+                        response_data = self._answer_shared(question, vector)[0]
+                        if not is_fallback(response_data):
+                            saved[key] = (response_data, vector, stored_at)
+                    except Exception as e:
+                        logger.warning(f"Could not warm sample question '{question}': {e}")
+        logger.info(f"✓ Sample questions cached ({len(SAMPLE_QUESTIONS)})")
+    
+    def get_status(self) -> Dict[str, Any]:
+        # No init_lock here: it is held for the whole initialization, which
+        # used to stall every status poll until loading finished
+        actual_doc_count = self.document_count
+        system = self.system
+        if system and hasattr(system, 'documents'):
+            actual_doc_count = len(system.documents)
+        
+        query_count = self.query_count
+        successful_queries = self.successful_queries
+        recent_times = tuple(self.recent_times)
+        return {
+            "ready": self.system_ready and actual_doc_count > 0,
+            "status": self.initialization_status,
+            "version": self.status_version,
+            "initializing": self.initializing,
+            "document_count": actual_doc_count,
+            "query_count": query_count,
+            "successful_queries": successful_queries,
+            "success_rate": (successful_queries / max(query_count, 1)) * 100,
+            "average_response_time": sum(recent_times) / max(len(recent_times), 1),
+            "cache_hits": self.query_cache.hits
+        }
+    
+    def process_query(self, query: str) -> Dict[str, Any]:
+        if not self.system_ready or not self.system:
+            raise ValueError("System not ready. Please wait for initialization to complete.")
+        
+        start_ns = time.perf_counter_ns()
+        
+        cached, vector = self.query_cache.lookup(query)
+        if cached is not None:
+            elapsed = (time.perf_counter_ns() - start_ns) / 1e9
+            self._record_query(True, elapsed)
+            # A semantic hit was answered for a differently worded question
+            return dict(cached, query=query, processing_time=elapsed, cached=True)
+        
+        success = False
+        try:
+            response_data, shared = self._answer_shared(query, vector)
+            if shared:
+                response_data = dict(response_data, cached=True,
+                                     processing_time=(time.perf_counter_ns() - start_ns) / 1e9)
+            success = True
+            logger.info("✓ Query processed: '%.50s...' (%.2fs)", query, response_data['processing_time'])
+            return response_data
+        except Exception:
+            logger.exception("Query processing error")
+            raise
+        finally:
+            self._record_query(success, (time.perf_counter_ns() - start_ns) / 1e9)
+    
+    def _answer_shared(self, query: str, vector: Optional[Any] = None) -> Tuple[Dict[str, Any], bool]:
+        """_answer, except that identical questions arriving together share one
+        pipeline run. Returns the response and whether it came from another
+        caller's run."""
+        key = QueryCache.normalize(query)
+        with self.inflight_lock:
+            pending = self.inflight.get(key)
+            if pending is None:
+                future = self.inflight[key] = Future()
+        if pending is not None:
+            return pending.result(timeout=INFLIGHT_WAIT), True
+        
+        try:
+            response_data = self._answer(query, vector)
+            future.set_result(response_data)
+            return response_data, False
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.inflight_lock:
+                del self.inflight[key]
+    
+    def _answer(self, query: str, vector: Optional[Any] = None) -> Dict[str, Any]:
+        """Run the pipeline for a query and cache the response, under
+        ``vector`` too when the cache lookup embedded the query. Error and
+        fallback answers are returned but not cached."""
+        start_ns = time.perf_counter_ns()
+        result = self.system.process_query_ultra_premium(query)
+        
+        response_data = {field: getattr(result, field) for field in RESULT_FIELDS}
+        response_data["sources"] = [
+            dict(source, content_preview=source.get("content_preview", "")[:PREVIEW_CHARS])
+            for source in result.sources
+        ]
+        response_data["query"] = query
+        response_data["processing_time"] = (time.perf_counter_ns() - start_ns) / 1e9
+        
+        if not is_fallback(response_data):
+            self.query_cache.store(query, response_data, vector)
+        return response_data
+
+    def submit_query(self, query: str) -> str:
+        """Run process_query on the worker pool and return a job id to poll."""
+        job_id = uuid.uuid4().hex
+        future = self.query_pool.submit(self.process_query, query)
+        with self.jobs_lock:
+            self.jobs[job_id] = future
+            # Oldest finished jobs first; one still running is never
+            # dropped, or its poller would get a 404 for a live query
+            excess = len(self.jobs) - MAX_TRACKED_JOBS
+            if excess > 0:
+                finished = [key for key, job in self.jobs.items() if job.done()]
+                for key in finished[:excess]:
+                    del self.jobs[key]
+        return job_id
+    
+    def get_job(self, job_id: str) -> Optional[Future]:
+        """Return the job's future, forgetting it once it has finished."""
+        with self.jobs_lock:
+            future = self.jobs.get(job_id)
+            if future is not None and future.done():
+                del self.jobs[job_id]
+            return future
+
+campus_app = CampusQueryApp()
+
+def minify_html(html: str) -> str:
+    """Drop indentation and blank lines. Newlines stay so the textarea placeholder keeps its lines."""
+    return "\n".join(line.strip() for line in html.splitlines() if line.strip())
+
+def asset_version(filename: str) -> str:
+    """Content hash for a static asset URL, so the browser can keep the file
+    for a year and still fetch a new copy as soon as it changes."""
+    with open(os.path.join(app.static_folder, filename), 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()[:12]
+
+@app.after_request
+def cache_versioned_assets(response):
+    # A ?v= URL names one version of the file, so browsers may keep it for a
+    # year without ever revalidating; unversioned URLs keep Flask's default
+    if request.endpoint == 'static' and 'v' in request.args and response.status_code == 200:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = ASSET_MAX_AGE
+        response.cache_control.immutable = True
+    return response
+
+def render_home() -> str:
+    with app.test_request_context('/'):
+        return render_template('standalone.html', sample_questions=SAMPLE_QUESTIONS,
+                               asset_version=asset_version)
+
+# The page has no per-request content, so it is rendered, minified and
+# compressed once at import instead of on every hit. Its CSS and JS are
+# static files, cached separately by the browser.
+HOME_HTML = minify_html(render_home()).encode('utf-8')
+HOME_HTML_GZ = gzip.compress(HOME_HTML, 9)
+HOME_ETAG = hashlib.md5(HOME_HTML).hexdigest()
+
+@app.route('/')
+@app.route('/assistant')
+def home():
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = app.response_class(HOME_HTML_GZ, mimetype='text/html')
+        response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(HOME_ETAG + '-gz')
+    else:
+        response = app.response_class(HOME_HTML, mimetype='text/html')
+        response.set_etag(HOME_ETAG)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    # Revalidation after max-age gets a 304 unless the page changed
+    return response.make_conditional(request)
+
+@app.route('/api/status')
+def api_status():
+    try:
+        # Long-poll: a client passing the version it last saw waits for the next change
+        version = request.args.get('version', type=int)
+        headers = {}
+        if version is not None and campus_app.initializing:
+            if not campus_app.wait_for_status_change(version, STATUS_WAIT_SECONDS):
+                headers['Retry-After'] = STATUS_RETRY_AFTER
+        
+        status = campus_app.get_status()
+        logger.debug("Status request: ready=%s, docs=%s", status['ready'], status['document_count'])
+        return jsonify(status), 200, headers
+    except Exception as e:
+        logger.error("Status error: %s", e)
+        return jsonify({
+            "ready": False, 
+            "status": f"Error: {str(e)}", 
+            "document_count": 0,
+            "query_count": 0,
+            "successful_queries": 0,
+            "success_rate": 0,
+            "average_response_time": 0
+        }), 500
+
+@app.route('/api/query', methods=['POST'])
+def api_query():
+    # Checked before the body is parsed: clients retrying during startup
+    # get the 503 without any other work
+    if not campus_app.system_ready:
+        return jsonify({"error": "System is still initializing. Please wait..."}), 503, \
+            {'Retry-After': NOT_READY_RETRY_AFTER}
+    
+    try:
+        data = request.get_json()
+        if not data or 'query' not in data:
+            return jsonify({"error": "No query provided"}), 400
+        
+        query = data['query'].strip()
+        if not query:
+            return jsonify({"error": "Empty query"}), 400
+        
+        # Async mode frees this request thread; the client polls /api/result/<job_id>
+        if data.get('async'):
+            return jsonify({"job_id": campus_app.submit_query(query)}), 202
+        
+        result = campus_app.process_query(query)
+        return jsonify(result)
+        
+    except Exception as e:
+        logger.exception("Query API error")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/result/<job_id>')
+def api_result(job_id):
+    future = campus_app.get_job(job_id)
+    if future is None:
+        return jsonify({"error": "Unknown or expired job"}), 404
+    if not future.done():
+        return jsonify({"state": "pending"}), 202
+    
+    try:
+        return jsonify(future.result())
+    except Exception as e:
+        logger.error("Query job error: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+app.register_blueprint(document_blueprint(lambda: system_config().UNIVERSITY_DOCS_DIR))
+
+@app.route('/favicon.ico')
+def favicon():
+    return '', 204
+
+@app.errorhandler(404)
+def not_found(error):
+    return jsonify({'error': 'Endpoint not found'}), 404
+
+@app.errorhandler(500)
+def internal_error(error):
+    logger.error(f"Internal error: {error}")
+    return jsonify({'error': 'Internal server error'}), 500
+
+if __name__ == '__main__':
+    config = system_config()
+    os.makedirs(config.UNIVERSITY_DOCS_DIR, exist_ok=True)
+    os.makedirs('./persistent_data', exist_ok=True)
+    
+    print("=" * 80)
+    print("🎓 VIT-AP UNIVERSITY ASSISTANT - ULTRA-PREMIUM SYSTEM")
+    print("=" * 80)
+    print(f"📁 Documents Directory: {config.UNIVERSITY_DOCS_DIR}")
+    print(f"🌐 Server URL: http://localhost:5000")
+    print(f"🔑 API Keys Configured: {len(config.GEMINI_API_KEYS)}")
+    print("=" * 80)
+    
+    # One pass over the directory; only the first few names are kept
+    sample, n = [], 0
+    with os.scandir(config.UNIVERSITY_DOCS_DIR) as entries:
+        for entry in entries:
+            if entry.name.endswith(('.pdf', '.docx', '.txt')) and entry.is_file():
+                n += 1
+                if len(sample) < 3:
+                    sample.append(entry.name)
+    print(f"📚 Found {n} documents")
+    if sample:
+        print(f"📄 Sample files: {', '.join(sample)}")
+        if n > 3:
+            print(f"   ... and {n - 3} more")
+    
+    print("=" * 80)
+    print("🚀 Starting Flask development server...")
+    print("   For production: gunicorn -c gunicorn.conf.py a:app")
+    print("💡 Open http://localhost:5000 in your browser")
+    print("   Wait 5-10 seconds for system initialization")
+    print("   Watch for 'System Ready!' status before asking questions")
+    print("=" * 80)
+    
+    app.run(
+        debug=False,
+        host='0.0.0.0',
+        port=5000,
+        threaded=True,
+        use_reloader=False
     )
\ No newline at end of file
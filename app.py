@@ -1,504 +1,797 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory, abort
-from flask_cors import CORS
-import os
-import sys
-import threading
-import time
-from typing import Dict, Any
-import logging
-import config  # Ensure you have a config.py with GEMINI_API_KEY defined
-
-# Add the directory containing uni.py to Python path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-# Import from your enhanced uni.py (now with FREE local embeddings!)
-from uni import (
-    UniversityDocumentProcessor,
-    UniversityQueryProcessor,
-    AnalysisResponse,
-    UNIVERSITY_DOCS_DIR,
-    VECTOR_STORE_DIR
-)
-
-app = Flask(__name__)
-app.config['SECRET_KEY'] = config.GEMINI_API_KEY
-
-# Enable CORS for PDF serving
-CORS(app, resources={
-    r"/docs/*": {"origins": "*"},
-    r"/api/*": {"origins": "*"},
-    r"/static/*": {"origins": "*"}
-})
-
-# Setup logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-class CampusQueryWebApp:
-    def __init__(self):
-        self.document_processor = UniversityDocumentProcessor()
-        self.query_processor = UniversityQueryProcessor()
-        self.system_ready = False
-        self.initialization_status = "Starting with FREE local embeddings..."
-        self.document_count = 0
-        self.last_result = None
-        self.initialize_system()
-
-    def initialize_system(self):
-        def init_thread():
-            try:
-                self.initialization_status = "📥 Loading university documents..."
-                logger.info("Starting document loading...")
-                
-                documents = self.document_processor.load_all_university_documents()
-                self.document_count = len(documents)
-                
-                logger.info(f"Loaded {self.document_count} document chunks")
-
-                if not documents:
-                    self.initialization_status = "⚠️ No documents found - Web search enabled"
-                    logger.warning(f"No documents found in {UNIVERSITY_DOCS_DIR}")
-                    # Still initialize system for web search
-                    self.query_processor.initialize_system([])
-                    self.system_ready = True
-                else:
-                    self.initialization_status = f"⚡ Processing {len(documents)} chunks with FREE embeddings..."
-                    logger.info(f"Initializing vector store with {len(documents)} documents")
-                    
-                    # Initialize with local embeddings (no quota issues!)
-                    self.query_processor.initialize_system(documents)
-                    
-                    self.system_ready = True
-                    self.initialization_status = "✅ System ready! (Using FREE local embeddings - No quotas!)"
-                    logger.info("🎉 CampusQuery initialized successfully with local embeddings")
-
-            except Exception as e:
-                self.initialization_status = f"❌ Initialization failed: {str(e)}"
-                logger.error(f"System initialization failed: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
-
-        threading.Thread(target=init_thread, daemon=True).start()
-
-    def get_status(self) -> Dict[str, Any]:
-        return {
-            "ready": self.system_ready,
-            "status": self.initialization_status,
-            "document_count": self.document_count,
-            "has_documents": self.document_count > 0,
-            "web_search_enabled": True,
-            "embedding_type": "local_free"  # NEW: Indicate we're using free embeddings
-        }
-
-    def process_query(self, query: str) -> Dict[str, Any]:
-        if not self.system_ready:
-            raise ValueError("System not ready")
-
-        try:
-            logger.info(f"Processing query: {query}")
-            result = self.query_processor.process_query(query)
-            self.last_result = result
-
-            response_data = {
-                "answer": result.answer,
-                "detailed_answer": result.detailed_answer,
-                "justification": result.justification,
-                "key_points": result.key_points,
-                "document_references": result.document_references,
-                "sources": [],
-                "applicable_sections": result.applicable_sections,
-                "query": query
-            }
-
-            for source in result.sources:
-                source_data = {
-                    "source_id": source.get("source_id", ""),
-                    "filename": source.get("filename", "Unknown"),
-                    "filepath": source.get("filepath", ""),
-                    "content_preview": source.get("content_preview", ""),
-                    "content_snippet": source.get("content_snippet", ""),
-                    "relevance": source.get("relevance", 0.0),
-                    "is_web_result": not source.get("filepath") or "Web Search" in source.get("filename", "")
-                }
-                response_data["sources"].append(source_data)
-
-            logger.info(f"Query processed successfully: {len(response_data['sources'])} sources found")
-            return response_data
-
-        except Exception as e:
-            logger.error(f"Query processing error: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            raise
-
-# Initialize the app
-campus_query_app = CampusQueryWebApp()
-
-# Routes
-@app.route('/')
-def dashboard():
-    """Main dashboard page"""
-    return render_template('dashboard.html')
-
-@app.route('/assistant')
-def assistant():
-    """Assistant interface page"""
-    return render_template('index.html')
-
-# Enhanced PDF serving route with proper headers
-@app.route('/docs/<path:filename>')
-def serve_document(filename):
-    """Serve PDF documents with proper CORS headers"""
-    try:
-        # Security: Prevent directory traversal
-        if '..' in filename or filename.startswith('/'):
-            logger.warning(f"Blocked potentially malicious file request: {filename}")
-            abort(404)
-        
-        docs_dir = os.path.abspath(UNIVERSITY_DOCS_DIR)
-        file_path = os.path.join(docs_dir, filename)
-        
-        # Check if file exists
-        if not os.path.isfile(file_path):
-            logger.warning(f"File not found: {file_path}")
-            abort(404)
-        
-        logger.info(f"Serving document: {filename}")
-        
-        response = send_from_directory(docs_dir, filename, as_attachment=False)
-        
-        # Set proper headers for PDF viewing
-        if filename.lower().endswith('.pdf'):
-            response.headers['Content-Type'] = 'application/pdf'
-            response.headers['Content-Disposition'] = f'inline; filename="{filename}"'
-            response.headers['X-Content-Type-Options'] = 'nosniff'
-            response.headers['Cache-Control'] = 'public, max-age=3600'
-            response.headers['X-Frame-Options'] = 'SAMEORIGIN'
-            response.headers['Access-Control-Allow-Origin'] = '*'
-        
-        return response
-        
-    except Exception as e:
-        logger.error(f"Error serving document {filename}: {e}")
-        abort(404)
-
-# Follow-up question endpoint
-@app.route('/api/followup', methods=['POST'])
-def api_followup():
-    """Generate follow-up question based on selected text"""
-    try:
-        data = request.get_json()
-        if not data or 'selected_text' not in data:
-            return jsonify({"error": "No selected text provided"}), 400
-        
-        selected_text = data['selected_text'].strip()
-        context = data.get('context', '')
-        document_name = data.get('document_name', '')
-        
-        if not selected_text:
-            return jsonify({"error": "Empty selected text"}), 400
-        
-        if not campus_query_app.system_ready:
-            return jsonify({"error": "System not ready"}), 503
-        
-        # Create prompt for follow-up question generation
-        question_prompt = f"""
-        Based on this selected text from the university document "{document_name}": 
-        
-        "{selected_text}"
-        
-        Context: {context}
-        
-        Generate a natural, specific follow-up question that would help a student understand this content better. 
-        The question should be:
-        1. Directly related to the selected text
-        2. Practical and useful for students
-        3. Clear and specific
-        4. Encourage deeper understanding
-        
-        Respond with just the question, nothing else.
-        """
-        
-        # Use Gemini for text generation (not embeddings - those are local now!)
-        model_client = campus_query_app.query_processor.model_client
-        follow_up_question = model_client.generate_content(question_prompt)
-        
-        logger.info(f"Generated follow-up question for document: {document_name}")
-        
-        return jsonify({
-            "question": follow_up_question,
-            "selected_text": selected_text,
-            "document_name": document_name
-        })
-        
-    except Exception as e:
-        logger.error(f"Follow-up question generation error: {e}")
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/api/status')
-def api_status():
-    """Get system status"""
-    status = campus_query_app.get_status()
-    logger.debug(f"Status requested: {status}")
-    return jsonify(status)
-
-@app.route('/api/query', methods=['POST'])
-def api_query():
-    """Process a user query"""
-    try:
-        data = request.get_json()
-        if not data or 'query' not in data:
-            return jsonify({"error": "No query provided"}), 400
-
-        query = data['query'].strip()
-        if not query:
-            return jsonify({"error": "Empty query"}), 400
-
-        if not campus_query_app.system_ready:
-            return jsonify({
-                "error": "System not ready",
-                "status": campus_query_app.initialization_status
-            }), 503
-
-        result = campus_query_app.process_query(query)
-        return jsonify(result)
-
-    except Exception as e:
-        logger.error(f"API query error: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/api/rebuild')
-def api_rebuild():
-    """Rebuild the vector store index"""
-    try:
-        logger.info("Rebuild requested")
-        campus_query_app.system_ready = False
-        campus_query_app.initialization_status = "Rebuilding index with local embeddings..."
-        campus_query_app.initialize_system()
-        return jsonify({
-            "message": "Index rebuild started",
-            "status": "rebuilding"
-        })
-    except Exception as e:
-        logger.error(f"Rebuild error: {e}")
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/api/export')
-def api_export():
-    """Export the last query result"""
-    if not campus_query_app.last_result:
-        return jsonify({"error": "No result to export"}), 400
-
-    try:
-        from datetime import datetime
-        export_data = {
-            "timestamp": datetime.now().isoformat(),
-            "query": getattr(campus_query_app.last_result, 'query', ''),
-            "answer": campus_query_app.last_result.answer,
-            "detailed_answer": campus_query_app.last_result.detailed_answer,
-            "justification": campus_query_app.last_result.justification,
-            "sources": campus_query_app.last_result.document_references,
-            "embedding_type": "local_free"  # Indicate free embeddings used
-        }
-        return jsonify(export_data)
-    except Exception as e:
-        logger.error(f"Export error: {e}")
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/api/cache/status')
-def api_cache_status():
-    """Get cache statistics (NEW endpoint)"""
-    try:
-        cache_dir = VECTOR_STORE_DIR
-        cache_file = os.path.join(cache_dir, "local_embeddings_cache.pkl")
-        index_file = os.path.join(cache_dir, "vector_index.pkl")
-        
-        cache_info = {
-            "cache_exists": os.path.exists(cache_file),
-            "index_exists": os.path.exists(index_file),
-            "cache_size": 0,
-            "index_size": 0
-        }
-        
-        if cache_info["cache_exists"]:
-            cache_info["cache_size"] = os.path.getsize(cache_file)
-        
-        if cache_info["index_exists"]:
-            cache_info["index_size"] = os.path.getsize(index_file)
-        
-        return jsonify(cache_info)
-    except Exception as e:
-        logger.error(f"Cache status error: {e}")
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/api/cache/clear', methods=['POST'])
-def api_cache_clear():
-    """Clear the embedding cache (NEW endpoint)"""
-    try:
-        import shutil
-        
-        if os.path.exists(VECTOR_STORE_DIR):
-            shutil.rmtree(VECTOR_STORE_DIR)
-            os.makedirs(VECTOR_STORE_DIR, exist_ok=True)
-            
-            logger.info("Cache cleared successfully")
-            return jsonify({
-                "message": "Cache cleared successfully",
-                "status": "success"
-            })
-        else:
-            return jsonify({
-                "message": "No cache to clear",
-                "status": "success"
-            })
-            
-    except Exception as e:
-        logger.error(f"Cache clear error: {e}")
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/api/system/info')
-def api_system_info():
-    """Get system information (NEW endpoint)"""
-    try:
-        import platform
-        import psutil
-        
-        # Get document statistics
-        doc_files = []
-        if os.path.exists(UNIVERSITY_DOCS_DIR):
-            doc_files = [f for f in os.listdir(UNIVERSITY_DOCS_DIR) 
-                        if os.path.isfile(os.path.join(UNIVERSITY_DOCS_DIR, f))]
-        
-        system_info = {
-            "python_version": platform.python_version(),
-            "platform": platform.system(),
-            "cpu_count": psutil.cpu_count(),
-            "memory_total_gb": round(psutil.virtual_memory().total / (1024**3), 2),
-            "memory_available_gb": round(psutil.virtual_memory().available / (1024**3), 2),
-            "documents_directory": UNIVERSITY_DOCS_DIR,
-            "vector_store_directory": VECTOR_STORE_DIR,
-            "document_files": len(doc_files),
-            "document_list": doc_files[:10],  # First 10 files
-            "embedding_type": "sentence-transformers (local)",
-            "embedding_model": "all-MiniLM-L6-v2",
-            "embedding_dimension": 384,
-            "quota_free": True
-        }
-        
-        return jsonify(system_info)
-    except Exception as e:
-        logger.error(f"System info error: {e}")
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/favicon.ico')
-def favicon():
-    """Favicon handler"""
-    return app.response_class(status=404)
-
-@app.route('/health')
-def health():
-    """Health check endpoint"""
-    return jsonify({
-        "status": "healthy",
-        "system_ready": campus_query_app.system_ready,
-        "initialization_status": campus_query_app.initialization_status,
-        "document_count": campus_query_app.document_count,
-        "embedding_type": "local_free"
-    })
-
-# Error handlers
-@app.errorhandler(404)
-def not_found(error):
-    return jsonify({"error": "Not found"}), 404
-
-@app.errorhandler(500)
-def internal_error(error):
-    logger.error(f"Internal server error: {error}")
-    return jsonify({"error": "Internal server error"}), 500
-
-@app.route('/api/soft-computing/stats')
-def api_soft_computing_stats():
-    """Get soft computing system statistics"""
-    try:
-        if not campus_query_app.system_ready:
-            return jsonify({"error": "System not ready"}), 503
-        
-        stats = campus_query_app.query_processor.metrics.get_query_statistics()
-        
-        return jsonify({
-            'soft_computing_enabled': True,
-            'techniques': [
-                'Neural Networks (Transformer Embeddings)',
-                'Fuzzy Logic (Relevance Scoring)',
-                'Classification (Query Intent)',
-                'Clustering (Document Organization)'
-            ],
-            'statistics': stats,
-            'embedding_model': 'all-MiniLM-L6-v2',
-            'fuzzy_membership_functions': ['very_low', 'low', 'medium', 'high', 'very_high']
-        })
-    except Exception as e:
-        logger.error(f"Stats error: {e}")
-        return jsonify({"error": str(e)}), 500
-
-if __name__ == '__main__':
-    # Create necessary directories
-    os.makedirs(UNIVERSITY_DOCS_DIR, exist_ok=True)
-    os.makedirs(VECTOR_STORE_DIR, exist_ok=True)
-    os.makedirs('templates', exist_ok=True)
-    os.makedirs('static/css', exist_ok=True)
-    os.makedirs('static/js', exist_ok=True)
-
-    print("\n" + "="*70)
-    print("🎓 CampusQuery Web Server Starting...")
-    print("="*70)
-    print(f"✅ Using FREE local embeddings (sentence-transformers)")
-    print(f"✅ No API quotas - Unlimited embeddings!")
-    print(f"✅ Automatic caching for instant performance")
-    print(f"📁 Documents directory: {UNIVERSITY_DOCS_DIR}")
-    print(f"💾 Vector store directory: {VECTOR_STORE_DIR}")
-    print(f"🌐 Server will be available at: http://localhost:5000")
-    print(f"📄 PDFs accessible at: http://localhost:5000/docs/filename.pdf")
-    print(f"🏥 Health check: http://localhost:5000/health")
-    print("="*70 + "\n")
-
-    # Check for existing documents
-    if os.path.exists(UNIVERSITY_DOCS_DIR):
-        doc_files = [f for f in os.listdir(UNIVERSITY_DOCS_DIR) 
-                    if os.path.isfile(os.path.join(UNIVERSITY_DOCS_DIR, f))]
-        if doc_files:
-            print(f"📚 Found {len(doc_files)} document(s) to process:")
-            for f in doc_files[:5]:  # Show first 5
-                print(f"   - {f}")
-            if len(doc_files) > 5:
-                print(f"   ... and {len(doc_files) - 5} more")
-            print()
-        else:
-            print("⚠️  No documents found!")
-            print(f"   Add PDF, DOCX, or TXT files to: {os.path.abspath(UNIVERSITY_DOCS_DIR)}")
-            print()
-
-    # Check for existing cache
-    cache_file = os.path.join(VECTOR_STORE_DIR, "local_embeddings_cache.pkl")
-    index_file = os.path.join(VECTOR_STORE_DIR, "vector_index.pkl")
-    
-    if os.path.exists(cache_file) or os.path.exists(index_file):
-        print("💾 Found existing cache - will load quickly!")
-        if os.path.exists(cache_file):
-            cache_size = os.path.getsize(cache_file) / 1024 / 1024
-            print(f"   Embeddings cache: {cache_size:.2f} MB")
-        if os.path.exists(index_file):
-            index_size = os.path.getsize(index_file) / 1024 / 1024
-            print(f"   Vector index: {index_size:.2f} MB")
-        print()
-    else:
-        print("🆕 First run - will create embeddings cache")
-        print("   (This takes a few minutes, then it's instant!)")
-        print()
-
-    print("🚀 Starting Flask server...")
-    print("="*70 + "\n")
-
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+from flask import Flask, Response, render_template, request, jsonify, session, stream_with_context
+import atexit
+import gzip
+import hashlib
+import os
+import platform
+import shutil
+import sys
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from functools import wraps
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, Any, Callable, Iterator, Optional, Tuple
+import logging
+import config  # Ensure you have a config.py with GEMINI_API_KEY defined
+
+# Request threads already run queries in parallel; one BLAS/OpenMP thread
+# per call avoids oversubscribing the CPU. Must be set before numpy/faiss load.
+for _var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+    os.environ.setdefault(_var, '1')
+os.environ.setdefault('OMP_WAIT_POLICY', 'PASSIVE')
+
+# Add the directory containing uni.py to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Import from your enhanced uni.py (now with FREE local embeddings!)
+from uni import (
+    UniversityDocumentProcessor,
+    UniversityQueryProcessor,
+    AnalysisResponse,
+    UNIVERSITY_DOCS_DIR,
+    VECTOR_STORE_DIR,
+    FAISS_INDEX_FILE,
+    DOCUMENTS_FILE
+)
+from query_cache import QueryCache
+from compression import use_gzip
+from cors import use_cors
+from json_provider import dumps_bytes, use_orjson
+from log_queue import use_queue_logging
+from doc_routes import document_blueprint, forget_resolved_documents
+
+app = Flask(__name__)
+app.config['SECRET_KEY'] = config.GEMINI_API_KEY
+use_orjson(app)
+use_gzip(app)
+
+# Enable CORS for PDF serving
+use_cors(app, prefixes=('/docs/', '/api/', '/static/'))
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+use_queue_logging()
+logger = logging.getLogger(__name__)
+
+# Answers are kept across restarts (if the index is unchanged) for up to a day
+QUERY_CACHE_FILE = os.path.join("persistent_data", "qcache.pkl")
+QUERY_CACHE_TTL = getattr(config, 'QUERY_CACHE_TTL', 24 * 3600)
+QUERY_CACHE_SIZE = getattr(config, 'QUERY_CACHE_SIZE', 512)
+# Cosine similarity above which a paraphrase reuses a cached answer
+SEMANTIC_CACHE_THRESHOLD = getattr(config, 'SEMANTIC_CACHE_THRESHOLD', 0.97)
+
+# Set to 1 to skip the warm-up query embedding (e.g. in CI without an API key)
+SKIP_WARMUP = os.environ.get('CAMPUSQUERY_SKIP_WARMUP') == '1'
+
+# /api/status is polled; log it when readiness changes or at most this often
+STATUS_LOG_INTERVAL = 60
+
+# Gemini calls made directly by request handlers run here, which bounds how
+# many are in flight at once and lets a slow call time out instead of
+# pinning its request thread indefinitely
+LLM_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix='llm')
+LLM_TIMEOUT = 30
+
+# How long a duplicate query waits on the identical one already running
+INFLIGHT_WAIT = 60
+
+# /api/wait_ready holds a request at most this long before answering 202
+READY_WAIT_SECONDS = 25
+# Requests held by /api/wait_ready at once. Each holds a request thread
+# (gunicorn.conf.py gives a worker 8), so open tabs can't starve queries and
+# static files; past this a request gets 202 at once and is told to retry
+MAX_READY_WAITERS = 2
+READY_RETRY_AFTER = '3'
+READY_WAITERS = threading.BoundedSemaphore(MAX_READY_WAITERS)
+
+# Seconds a client is told to wait before retrying a query during startup
+NOT_READY_RETRY_AFTER = '5'
+
+# Browser sessions whose latest answer is kept for /api/export
+MAX_SESSION_RESULTS = 64
+
+class CampusQueryWebApp:
+    def __init__(self):
+        self.document_processor = UniversityDocumentProcessor()
+        self.query_processor = UniversityQueryProcessor()
+        # Set once the index is published; a rebuild keeps serving the old one
+        self.ready_event = threading.Event()
+        self.initialization_status = "Starting with FREE local embeddings..."
+        self.document_count = 0
+        # Session id -> that session's latest answer payload, least recent first
+        self.last_results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.last_results_lock = threading.Lock()
+        # Resolves to system_ready when the current (re)initialization ends
+        self.init_future: Future = Future()
+        # Held while an initialization or rebuild runs
+        self._init_lock = threading.Lock()
+        self._last_status_log_ts = 0.0
+        self._last_ready = False
+        # Normalized query -> Future of the pipeline run currently answering it
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self.query_cache = QueryCache(maxsize=QUERY_CACHE_SIZE, embed_fn=self.query_processor.embed_query,
+                                      threshold=SEMANTIC_CACHE_THRESHOLD, ttl=QUERY_CACHE_TTL)
+        atexit.register(self.save_query_cache)
+        self.initialize_system()
+
+    @property
+    def system_ready(self) -> bool:
+        return self.ready_event.is_set()
+
+    def save_query_cache(self):
+        # Only a cache built against the current index is worth keeping
+        if not self.system_ready:
+            return
+        try:
+            self.query_cache.save(QUERY_CACHE_FILE)
+        except Exception as e:
+            logger.warning(f"Could not save query cache: {e}")
+
+    def initialize_system(self, rebuild: bool = False) -> bool:
+        """Start (re)initializing in the background; False if one is already running."""
+        if not self._init_lock.acquire(blocking=False):
+            return False
+        if rebuild:
+            self.initialization_status = "Rebuilding index with local embeddings..."
+
+        def init_thread():
+            try:
+                # Warm start: a saved index makes re-parsing every document unnecessary
+                if not rebuild and self.query_processor.load_persisted_index():
+                    try:
+                        loaded = self.query_cache.load(QUERY_CACHE_FILE)
+                        logger.info(f"Restored {loaded} cached answers")
+                    except Exception as e:
+                        logger.warning(f"Could not restore query cache: {e}")
+                    self.document_count = len(self.query_processor.documents)
+                    if not SKIP_WARMUP:
+                        self.initialization_status = "🔥 Warming up..."
+                        try:
+                            self.query_processor.warm_up()
+                        except Exception as e:
+                            logger.warning(f"Warm-up failed: {e}")
+                    self.ready_event.set()
+                    self.initialization_status = "✅ System ready! (Loaded saved index)"
+                    logger.info(f"Loaded saved index with {self.document_count} chunks")
+                    return
+
+                self.initialization_status = "📥 Loading university documents..."
+                logger.info("Starting document loading...")
+                
+                documents = self.document_processor.load_all_university_documents()
+                self.document_count = len(documents)
+                
+                logger.info(f"Loaded {self.document_count} document chunks")
+
+                if not documents:
+                    self.initialization_status = "⚠️ No documents found - Web search enabled"
+                    logger.warning(f"No documents found in {UNIVERSITY_DOCS_DIR}")
+                    # Answer from web search only; on a rebuild this also drops
+                    # the index of the documents that were removed
+                    self.query_processor.clear_index()
+                    self.query_cache.clear()
+                    self.ready_event.set()
+                else:
+                    self.initialization_status = f"⚡ Processing {len(documents)} chunks with FREE embeddings..."
+                    logger.info(f"Initializing vector store with {len(documents)} documents")
+                    
+                    # Initialize with local embeddings (no quota issues!)
+                    # On a rebuild the old index keeps answering until this swaps it
+                    self.query_processor.initialize_system(documents, rebuild=rebuild)
+                    
+                    # Cached answers may cite chunks from the previous index
+                    self.query_cache.clear()
+                    self.ready_event.set()
+                    self.initialization_status = "✅ System ready! (Using FREE local embeddings - No quotas!)"
+                    logger.info("🎉 CampusQuery initialized successfully with local embeddings")
+
+            except Exception as e:
+                self.initialization_status = f"❌ Initialization failed: {str(e)}"
+                logger.error(f"System initialization failed: {e}")
+                logger.error(traceback.format_exc())
+
+        future = self.init_future = Future()
+
+        def run():
+            try:
+                init_thread()
+            finally:
+                self._init_lock.release()
+            future.set_result(self.system_ready)
+
+        threading.Thread(target=run, daemon=True).start()
+        return True
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.system_ready,
+            "status": self.initialization_status,
+            "document_count": self.document_count,
+            "has_documents": self.document_count > 0,
+            "web_search_enabled": True,
+            "embedding_type": "local_free",  # NEW: Indicate we're using free embeddings
+            "cache_hits": self.query_cache.hits
+        }
+
+    def log_status(self, status: Dict[str, Any]):
+        now = time.time()
+        if status['ready'] == self._last_ready and now - self._last_status_log_ts < STATUS_LOG_INTERVAL:
+            return
+        self._last_ready = status['ready']
+        self._last_status_log_ts = now
+        logger.info("Status: ready=%s, docs=%s, status=%s",
+                    status['ready'], status['document_count'], status['status'])
+
+    def process_query(self, query: str) -> Dict[str, Any]:
+        if not self.system_ready:
+            raise ValueError("System not ready")
+
+        # Identical questions arriving together share one pipeline run
+        key = QueryCache.normalize(query)
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                future = self._inflight[key] = Future()
+        if pending is not None:
+            logger.info("Waiting on in-flight query: %s", query)
+            # Each follower gets its own copy; the leader returns the original
+            return dict(pending.result(timeout=INFLIGHT_WAIT))
+
+        try:
+            response_data = self._run_query(query)
+            future.set_result(response_data)
+            return response_data
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    def _run_query(self, query: str) -> Dict[str, Any]:
+        try:
+            cached, query_vector = self.query_cache.lookup(query)
+            if cached is not None:
+                logger.info("Cache hit for query: %s", query)
+                return self._hit_payload(cached, query, query_vector)
+
+            logger.info("Processing query: %s", query)
+            result = self.query_processor.process_query(query, query_vector=query_vector)
+            response_data = self._remember(query, result, query_vector)
+
+            logger.info("Query processed successfully: %d sources found", len(response_data['sources']))
+            return response_data
+
+        except Exception as e:
+            logger.error(f"Query processing error: {e}")
+            logger.error(traceback.format_exc())
+            raise
+
+    def stream_query(self, query: str) -> Iterator[Tuple[str, Any]]:
+        """Yield ("sources", filenames) after retrieval, ("token", text) events
+        while the answer is generated, then ("result", response_data) with the
+        same payload /api/query returns. An ("answer", response_data) without
+        the detailed answer may come just before the result."""
+        if not self.system_ready:
+            raise ValueError("System not ready")
+
+        cached, query_vector = self.query_cache.lookup(query)
+        if cached is not None:
+            yield "result", self._hit_payload(cached, query, query_vector)
+            return
+
+        for event, payload in self.query_processor.process_query_stream(query, query_vector=query_vector):
+            if event == "result":
+                payload = self._remember(query, payload, query_vector)
+            elif event == "answer":
+                payload = payload.to_response_dict(query)
+            yield event, payload
+
+    def set_last_result(self, session_id: str, response_data: Dict[str, Any]):
+        with self.last_results_lock:
+            self.last_results[session_id] = response_data
+            self.last_results.move_to_end(session_id)
+            while len(self.last_results) > MAX_SESSION_RESULTS:
+                self.last_results.popitem(last=False)
+
+    def get_last_result(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self.last_results_lock:
+            return self.last_results.get(session_id)
+
+    @staticmethod
+    def _hit_payload(cached: Dict[str, Any], query: str, query_vector) -> Dict[str, Any]:
+        # Semantic hits (the lookup embedded the query) answer a differently
+        # worded question; report the one that was asked
+        if query_vector is not None:
+            return dict(cached, query=query)
+        return cached
+
+    def _remember(self, query: str, result: AnalysisResponse, query_vector=None) -> Dict[str, Any]:
+        """Convert a pipeline result to the API payload, caching it unless it is an error."""
+        response_data = result.to_response_dict(query)
+
+        # Don't pin error answers in the cache. The entry is the payload exact
+        # hits return, built once here rather than copied on every hit
+        if not result.failed:
+            self.query_cache.store(query, dict(response_data, cache_hit=True), query_vector)
+
+        return response_data
+
+# Initialize the app. Document-parsing worker processes re-run this file as
+# __mp_main__ when it is started directly; they must not start another app
+if __name__ != '__mp_main__':
+    campus_query_app = CampusQueryWebApp()
+
+def ttl_memoize(seconds: float):
+    """Reuse a zero-argument function's result for ``seconds``. Used for the
+    info endpoints, whose stat/psutil calls cost more than the data is worth
+    refreshing on every request."""
+    def decorator(func: Callable[[], Any]) -> Callable[[], Any]:
+        cached: Dict[str, Any] = {"expires": 0.0, "value": None}
+
+        @wraps(func)
+        def wrapper():
+            now = time.monotonic()
+            if now >= cached["expires"]:
+                cached["value"] = func()
+                cached["expires"] = now + seconds
+            return cached["value"]
+
+        wrapper.cache_clear = lambda: cached.update(expires=0.0)
+        return wrapper
+    return decorator
+
+def session_id() -> str:
+    """Id of the browser session, assigned on first use. Must be called
+    before a streamed response starts, while the cookie can still be set."""
+    sid = session.get('sid')
+    if sid is None:
+        sid = session['sid'] = uuid.uuid4().hex
+    return sid
+
+def file_size(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return None
+
+# Routes
+# The pages have no per-request content, so each is rendered and gzipped
+# once and the (plain, gzipped, etag) reused
+_rendered_pages: Dict[str, Tuple[bytes, bytes, str]] = {}
+
+def render_static_page(template_name: str):
+    page = _rendered_pages.get(template_name)
+    if page is None or app.debug:
+        html = render_template(template_name).encode('utf-8')
+        page = _rendered_pages[template_name] = (
+            html, gzip.compress(html, 9), hashlib.md5(html).hexdigest()
+        )
+    html, html_gz, etag = page
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = app.response_class(html_gz, mimetype='text/html')
+        response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(etag + '-gz')
+    else:
+        response = app.response_class(html, mimetype='text/html')
+        response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'public, max-age=300'
+    # Revalidation after max-age gets a 304 unless the page changed
+    return response.make_conditional(request)
+
+@app.route('/')
+def dashboard():
+    """Main dashboard page"""
+    return render_static_page('dashboard.html')
+
+@app.route('/assistant')
+def assistant():
+    """Assistant interface page"""
+    return render_static_page('index.html')
+
+# PDFs cited in answers, served inline
+app.register_blueprint(document_blueprint(lambda: UNIVERSITY_DOCS_DIR))
+
+# Follow-up question endpoint
+@app.route('/api/followup', methods=['POST'])
+def api_followup():
+    """Generate follow-up question based on selected text"""
+    try:
+        data = request.get_json()
+        if not data or 'selected_text' not in data:
+            return jsonify({"error": "No selected text provided"}), 400
+        
+        selected_text = data['selected_text'].strip()
+        context = data.get('context', '')
+        document_name = data.get('document_name', '')
+        
+        if not selected_text:
+            return jsonify({"error": "Empty selected text"}), 400
+        
+        if not campus_query_app.system_ready:
+            return jsonify({"error": "System not ready"}), 503
+        
+        # Create prompt for follow-up question generation
+        question_prompt = f"""
+        Based on this selected text from the university document "{document_name}": 
+        
+        "{selected_text}"
+        
+        Context: {context}
+        
+        Generate a natural, specific follow-up question that would help a student understand this content better. 
+        The question should be:
+        1. Directly related to the selected text
+        2. Practical and useful for students
+        3. Clear and specific
+        4. Encourage deeper understanding
+        
+        Respond with just the question, nothing else.
+        """
+        
+        # Use Gemini for text generation (not embeddings - those are local now!)
+        model_client = campus_query_app.query_processor.model_client
+        future = LLM_POOL.submit(model_client.generate_content, question_prompt)
+        try:
+            follow_up_question = future.result(timeout=LLM_TIMEOUT)
+        except FutureTimeout:
+            # Still queued behind other calls: drop it rather than spend a
+            # Gemini call on an answer nobody is waiting for
+            future.cancel()
+            logger.warning("Follow-up question timed out for document: %s", document_name)
+            return jsonify({"error": "Follow-up generation timed out"}), 504
+        
+        logger.info("Generated follow-up question for document: %s", document_name)
+        
+        return jsonify({
+            "question": follow_up_question,
+            "selected_text": selected_text,
+            "document_name": document_name
+        })
+        
+    except Exception as e:
+        logger.error(f"Follow-up question generation error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+def not_ready_response():
+    return jsonify({
+        "error": "System not ready",
+        "status": campus_query_app.initialization_status
+    }), 503, {'Retry-After': NOT_READY_RETRY_AFTER}
+
+@app.route('/api/status')
+def api_status():
+    """Get system status"""
+    status = campus_query_app.get_status()
+    campus_query_app.log_status(status)
+    return jsonify(status)
+
+@app.route('/api/wait_ready')
+def api_wait_ready():
+    """Status once initialization finishes; 202 if it is still running after READY_WAIT_SECONDS"""
+    init_future = campus_query_app.init_future
+    if init_future.done():
+        return jsonify(campus_query_app.get_status())
+    if not READY_WAITERS.acquire(blocking=False):
+        return jsonify(campus_query_app.get_status()), 202, {'Retry-After': READY_RETRY_AFTER}
+    try:
+        init_future.result(timeout=READY_WAIT_SECONDS)
+    except FutureTimeout:
+        return jsonify(campus_query_app.get_status()), 202
+    finally:
+        READY_WAITERS.release()
+    return jsonify(campus_query_app.get_status())
+
+@app.route('/api/query', methods=['POST'])
+def api_query():
+    """Process a user query"""
+    # Checked before the body is parsed: clients retrying during startup
+    # get the 503 without any other work
+    if not campus_query_app.system_ready:
+        return not_ready_response()
+
+    try:
+        data = request.get_json()
+        if not data or 'query' not in data:
+            return jsonify({"error": "No query provided"}), 400
+
+        query = data['query'].strip()
+        if not query:
+            return jsonify({"error": "Empty query"}), 400
+
+        result = campus_query_app.process_query(query)
+        campus_query_app.set_last_result(session_id(), result)
+        return jsonify(result)
+
+    except Exception as e:
+        logger.error(f"API query error: {e}")
+        logger.error(traceback.format_exc())
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/query_stream')
+def api_query_stream():
+    """Stream a query's answer as Server-Sent Events"""
+    if not campus_query_app.system_ready:
+        return not_ready_response()
+
+    query = request.args.get('query', '').strip()
+    if not query:
+        return jsonify({"error": "No query provided"}), 400
+
+    sid = session_id()
+
+    def generate():
+        try:
+            for event, payload in campus_query_app.stream_query(query):
+                if event == "result":
+                    campus_query_app.set_last_result(sid, payload)
+                yield b"event: %s\ndata: %s\n\n" % (event.encode('ascii'), dumps_bytes(app, payload))
+        except Exception as e:
+            logger.error(f"API query stream error: {e}")
+            # Not "error": EventSource reserves that name for connection failures
+            yield b"event: failure\ndata: %s\n\n" % dumps_bytes(app, {'error': str(e)})
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/rebuild', methods=['POST'])
+def api_rebuild():
+    """Rebuild the vector store index"""
+    try:
+        logger.info("Rebuild requested")
+        forget_resolved_documents()
+        if not campus_query_app.initialize_system(rebuild=True):
+            return jsonify({"error": "A rebuild is already running"}), 409
+        return jsonify({
+            "message": "Index rebuild started",
+            "status": "rebuilding"
+        })
+    except Exception as e:
+        logger.error(f"Rebuild error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/export')
+def api_export():
+    """Export the last query result"""
+    last_result = campus_query_app.get_last_result(session_id())
+    if not last_result:
+        return jsonify({"error": "No result to export"}), 400
+
+    try:
+        export_data = {
+            "timestamp": datetime.now().isoformat(),
+            "query": last_result["query"],
+            "answer": last_result["answer"],
+            "detailed_answer": last_result["detailed_answer"],
+            "justification": last_result["justification"],
+            "sources": last_result["document_references"],
+            "embedding_type": "local_free"  # Indicate free embeddings used
+        }
+        return jsonify(export_data)
+    except Exception as e:
+        logger.error(f"Export error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@ttl_memoize(5)
+def vector_store_files() -> Dict[str, Any]:
+    # "cache" is the pickled chunk store, "index" the memory-mapped FAISS file
+    cache_size = file_size(DOCUMENTS_FILE)
+    index_size = file_size(FAISS_INDEX_FILE)
+    return {
+        "cache_exists": cache_size is not None,
+        "index_exists": index_size is not None,
+        "cache_size": cache_size or 0,
+        "index_size": index_size or 0
+    }
+
+@app.route('/api/cache/status')
+def api_cache_status():
+    """Get cache statistics (NEW endpoint)"""
+    try:
+        cache_info = dict(vector_store_files(), cached_queries=len(campus_query_app.query_cache))
+        return jsonify(cache_info)
+    except Exception as e:
+        logger.error(f"Cache status error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/cache/clear', methods=['POST'])
+def api_cache_clear():
+    """Clear the embedding cache (NEW endpoint)"""
+    try:
+        if os.path.exists(VECTOR_STORE_DIR):
+            shutil.rmtree(VECTOR_STORE_DIR)
+            os.makedirs(VECTOR_STORE_DIR, exist_ok=True)
+            vector_store_files.cache_clear()
+            
+            logger.info("Cache cleared successfully")
+            return jsonify({
+                "message": "Cache cleared successfully",
+                "status": "success"
+            })
+        else:
+            return jsonify({
+                "message": "No cache to clear",
+                "status": "success"
+            })
+            
+    except Exception as e:
+        logger.error(f"Cache clear error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/cache/queries/clear', methods=['POST'])
+def api_query_cache_clear():
+    """Forget cached answers, keeping the vector store"""
+    try:
+        cleared = len(campus_query_app.query_cache)
+        campus_query_app.query_cache.clear()
+        if os.path.exists(QUERY_CACHE_FILE):
+            os.remove(QUERY_CACHE_FILE)
+
+        logger.info(f"Cleared {cleared} cached answers")
+        return jsonify({
+            "message": f"Cleared {cleared} cached answers",
+            "status": "success"
+        })
+
+    except Exception as e:
+        logger.error(f"Query cache clear error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@ttl_memoize(5)
+def system_info() -> Dict[str, Any]:
+    # Optional dependency, only needed here
+    import psutil
+
+    # Get document statistics; scandir's is_file() reuses the directory entry
+    doc_files = []
+    try:
+        with os.scandir(UNIVERSITY_DOCS_DIR) as entries:
+            doc_files = [entry.name for entry in entries if entry.is_file()]
+    except FileNotFoundError:
+        pass
+
+    memory = psutil.virtual_memory()
+    return {
+        "python_version": platform.python_version(),
+        "platform": platform.system(),
+        "cpu_count": psutil.cpu_count(),
+        "memory_total_gb": round(memory.total / (1024**3), 2),
+        "memory_available_gb": round(memory.available / (1024**3), 2),
+        "documents_directory": UNIVERSITY_DOCS_DIR,
+        "vector_store_directory": VECTOR_STORE_DIR,
+        "document_files": len(doc_files),
+        "document_list": doc_files[:10],  # First 10 files
+        "embedding_type": "sentence-transformers (local)",
+        "embedding_model": "all-MiniLM-L6-v2",
+        "embedding_dimension": 384,
+        "quota_free": True
+    }
+
+@app.route('/api/system/info')
+def api_system_info():
+    """Get system information (NEW endpoint)"""
+    try:
+        return jsonify(dict(system_info(), embedding_dtype=campus_query_app.query_processor.embedding_dtype))
+    except Exception as e:
+        logger.error(f"System info error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/favicon.ico')
+def favicon():
+    """Favicon handler"""
+    return app.response_class(status=404)
+
+@app.route('/health')
+def health():
+    """Health check endpoint"""
+    return jsonify({
+        "status": "healthy",
+        "system_ready": campus_query_app.system_ready,
+        "initialization_status": campus_query_app.initialization_status,
+        "document_count": campus_query_app.document_count,
+        "embedding_type": "local_free"
+    })
+
+# Error handlers
+@app.errorhandler(404)
+def not_found(error):
+    return jsonify({"error": "Not found"}), 404
+
+@app.errorhandler(500)
+def internal_error(error):
+    logger.error(f"Internal server error: {error}")
+    return jsonify({"error": "Internal server error"}), 500
+
+@app.route('/api/soft-computing/stats')
+def api_soft_computing_stats():
+    """Get soft computing system statistics"""
+    try:
+        if not campus_query_app.system_ready:
+            return jsonify({"error": "System not ready"}), 503
+        
+        stats = campus_query_app.query_processor.metrics.get_query_statistics()
+        
+        return jsonify({
+            'soft_computing_enabled': True,
+            'techniques': [
+                'Neural Networks (Transformer Embeddings)',
+                'Fuzzy Logic (Relevance Scoring)',
+                'Classification (Query Intent)',
+                'Clustering (Document Organization)'
+            ],
+            'statistics': stats,
+            'embedding_model': 'all-MiniLM-L6-v2',
+            'fuzzy_membership_functions': ['very_low', 'low', 'medium', 'high', 'very_high']
+        })
+    except Exception as e:
+        logger.error(f"Stats error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+if __name__ == '__main__':
+    # Create necessary directories
+    os.makedirs(UNIVERSITY_DOCS_DIR, exist_ok=True)
+    os.makedirs(VECTOR_STORE_DIR, exist_ok=True)
+    os.makedirs('templates', exist_ok=True)
+    os.makedirs('static/css', exist_ok=True)
+    os.makedirs('static/js', exist_ok=True)
+
+    print("\n" + "="*70)
+    print("🎓 CampusQuery Web Server Starting...")
+    print("="*70)
+    print(f"✅ Using FREE local embeddings (sentence-transformers)")
+    print(f"✅ No API quotas - Unlimited embeddings!")
+    print(f"✅ Automatic caching for instant performance")
+    print(f"📁 Documents directory: {UNIVERSITY_DOCS_DIR}")
+    print(f"💾 Vector store directory: {VECTOR_STORE_DIR}")
+    print(f"🌐 Server will be available at: http://localhost:5000")
+    print(f"📄 PDFs accessible at: http://localhost:5000/docs/filename.pdf")
+    print(f"🏥 Health check: http://localhost:5000/health")
+    print("="*70 + "\n")
+
+    # Check for existing documents
+    if os.path.exists(UNIVERSITY_DOCS_DIR):
+        doc_files = [f for f in os.listdir(UNIVERSITY_DOCS_DIR) 
+                    if os.path.isfile(os.path.join(UNIVERSITY_DOCS_DIR, f))]
+        if doc_files:
+            print(f"📚 Found {len(doc_files)} document(s) to process:")
+            for f in doc_files[:5]:  # Show first 5
+                print(f"   - {f}")
+            if len(doc_files) > 5:
+                print(f"   ... and {len(doc_files) - 5} more")
+            print()
+        else:
+            print("⚠️  No documents found!")
+            print(f"   Add PDF, DOCX, or TXT files to: {os.path.abspath(UNIVERSITY_DOCS_DIR)}")
+            print()
+
+    # Check for existing cache
+    cache_file = DOCUMENTS_FILE
+    index_file = FAISS_INDEX_FILE
+    
+    if os.path.exists(cache_file) or os.path.exists(index_file):
+        print("💾 Found existing cache - will load quickly!")
+        if os.path.exists(cache_file):
+            cache_size = os.path.getsize(cache_file) / 1024 / 1024
+            print(f"   Chunk store: {cache_size:.2f} MB")
+        if os.path.exists(index_file):
+            index_size = os.path.getsize(index_file) / 1024 / 1024
+            print(f"   Vector index: {index_size:.2f} MB")
+        print()
+    else:
+        print("🆕 First run - will create embeddings cache")
+        print("   (This takes a few minutes, then it's instant!)")
+        print()
+
+    print("🚀 Starting Flask development server...")
+    print("   For production: gunicorn -c gunicorn.conf.py app:app")
+    print("="*70 + "\n")
+
+    # The reloader would start a second process that builds its own index
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1', host='0.0.0.0', port=5000,
+            threaded=True, use_reloader=False)
\ No newline at end of file
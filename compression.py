@@ -0,0 +1,89 @@
+# compression.py
+import gzip
+import os
+from typing import Dict, Tuple
+
+from flask import request
+from werkzeug.security import safe_join
+
+# Small bodies aren't worth the CPU or the gzip header
+GZIP_MIN_SIZE = 1024
+# Dynamic responses are compressed per request; 6 is the usual speed/size balance
+GZIP_LEVEL = 6
+COMPRESSIBLE_MIMETYPES = {'application/json'}
+# Static text assets are compressed once per file version at the maximum level
+STATIC_COMPRESSIBLE_MIMETYPES = {'text/css', 'text/javascript', 'application/javascript'}
+STATIC_GZIP_LEVEL = 9
+
+# (path, mtime_ns, size) -> gzipped file contents
+_static_gz: Dict[Tuple[str, int, int], bytes] = {}
+
+
+def _gzipped_static(path: str) -> bytes:
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    body = _static_gz.get(key)
+    if body is None:
+        with open(path, 'rb') as f:
+            body = gzip.compress(f.read(), STATIC_GZIP_LEVEL)
+        _static_gz[key] = body
+    return body
+
+
+def use_gzip(app):
+    """Gzip ``app``'s JSON responses for clients that accept it.
+
+    Query answers carry long, repetitive text, so they shrink several-fold.
+    Streamed responses (SSE) and files (send_file) are left alone, as are
+    responses that are already encoded, such as the pre-gzipped pages. The
+    exception is the static CSS and JS, whose gzipped copies are kept in
+    memory until the file changes.
+    """
+
+    @app.after_request
+    def gzip_response(response):
+        if request.endpoint == 'static':
+            return gzip_static(response)
+        if (response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or response.status_code != 200
+                or response.direct_passthrough
+                or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or 'gzip' not in request.headers.get('Accept-Encoding', '')):
+            return response
+
+        body = response.get_data()
+        if len(body) < GZIP_MIN_SIZE:
+            return response
+
+        response.set_data(gzip.compress(body, GZIP_LEVEL))
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        return response
+
+    def gzip_static(response):
+        if (response.mimetype not in STATIC_COMPRESSIBLE_MIMETYPES
+                or response.status_code != 200
+                or 'Content-Encoding' in response.headers
+                or 'X-Sendfile' in response.headers
+                or 'gzip' not in request.headers.get('Accept-Encoding', '')):
+            return response
+
+        path = safe_join(app.static_folder, request.view_args['filename'])
+        try:
+            body = _gzipped_static(path)
+        except OSError:
+            return response
+
+        # Drop the open file send_file handed over before swapping the body
+        response.close()
+        response.direct_passthrough = False
+        response.set_data(body)
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        # Same tag, marked weak (as nginx does): the encoded bytes differ, and
+        # send_file's If-None-Match check, which compares weakly, still gives 304s
+        etag, _ = response.get_etag()
+        if etag:
+            response.set_etag(etag, weak=True)
+        return response
@@ -0,0 +1,31 @@
+# cors.py
+from typing import Tuple
+
+from flask import request
+
+CORS_METHODS = 'GET, HEAD, OPTIONS, POST'
+# Browsers may cache a preflight answer for this long
+CORS_MAX_AGE = '86400'
+
+
+def use_cors(app, prefixes: Tuple[str, ...] = ('/api/', '/docs/', '/static/')):
+    """Allow any origin on paths under ``prefixes``.
+
+    The apps only ever allowed ``*``, so this covers what flask-cors was used
+    for with one ``str.startswith`` per response instead of its per-request
+    resource regex matching. Flask already answers OPTIONS for every route;
+    preflights get the allowed methods and the requested headers echoed.
+    """
+
+    @app.after_request
+    def cors_headers(response):
+        if not request.path.startswith(prefixes):
+            return response
+        response.headers['Access-Control-Allow-Origin'] = '*'
+        if request.method == 'OPTIONS':
+            response.headers['Access-Control-Allow-Methods'] = CORS_METHODS
+            requested = request.headers.get('Access-Control-Request-Headers')
+            if requested:
+                response.headers['Access-Control-Allow-Headers'] = requested
+            response.headers['Access-Control-Max-Age'] = CORS_MAX_AGE
+        return response
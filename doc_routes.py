@@ -0,0 +1,134 @@
+# doc_routes.py
+import functools
+import logging
+import mimetypes
+import os
+from typing import Callable, Optional
+from urllib.parse import quote
+
+from flask import Blueprint, Response, abort, send_file
+
+logger = logging.getLogger(__name__)
+
+# Documents only change between index rebuilds; after this the browser
+# revalidates with the ETag and normally gets a 304
+DOCUMENT_MAX_AGE = 24 * 3600
+
+# Behind nginx, set this to an internal location aliased to the documents
+# directory, e.g.  location /_protected_docs/ { internal; alias /srv/docs/; }
+# The app then only checks the path and nginx sends the file itself.
+DOCS_ACCEL_PREFIX = os.environ.get("CAMPUSQUERY_DOCS_ACCEL_PREFIX")
+# Behind Apache with mod_xsendfile: send_file answers with an X-Sendfile
+# header naming the file and Apache sends it
+DOCS_X_SENDFILE = os.environ.get("CAMPUSQUERY_X_SENDFILE") == "1"
+
+
+@functools.lru_cache(maxsize=8)
+def document_root(docs_dir: str) -> str:
+    return os.path.realpath(docs_dir)
+
+
+@functools.lru_cache(maxsize=4096)
+def resolve_document(docs_dir: str, filename: str) -> Optional[str]:
+    """Real path of ``filename`` inside ``docs_dir``, or None if it would
+    escape the directory, whether through ``..`` or a symlink pointing
+    outside. Cached per name; call ``forget_resolved_documents`` when the
+    documents directory is reorganised (e.g. on rebuild)."""
+    root = document_root(docs_dir)
+    path = os.path.realpath(os.path.join(root, filename))
+    if path == root or os.path.commonpath([root, path]) != root:
+        return None
+    return path
+
+
+@functools.lru_cache(maxsize=64)
+def document_mimetype(extension: str) -> str:
+    if extension == '.pdf':
+        return 'application/pdf'
+    return mimetypes.guess_type('x' + extension)[0] or 'application/octet-stream'
+
+
+def forget_resolved_documents():
+    document_root.cache_clear()
+    resolve_document.cache_clear()
+
+
+def document_blueprint(get_docs_dir: Callable[[], str]) -> Blueprint:
+    """``/docs/<filename>`` route shared by both Flask apps.
+
+    ``get_docs_dir`` is called per request so a.py can read its documents
+    directory from config that is only imported after startup.
+    """
+    bp = Blueprint('documents', __name__)
+
+    @bp.record_once
+    def enable_x_sendfile(state):
+        if DOCS_X_SENDFILE:
+            state.app.config['USE_X_SENDFILE'] = True
+
+    @bp.route('/docs/<path:filename>')
+    def serve_document(filename):
+        docs_dir = get_docs_dir()
+        file_path = resolve_document(docs_dir, filename)
+        if file_path is None:
+            logger.warning("Blocked potentially malicious file request: %s", filename)
+            abort(404)
+
+        extension = os.path.splitext(file_path)[1].lower()
+        is_pdf = extension == '.pdf'
+        # One lookup per extension instead of mimetypes' per-request guess
+        mimetype = document_mimetype(extension)
+        if DOCS_ACCEL_PREFIX:
+            relative = file_path[len(document_root(docs_dir)) + 1:].replace(os.sep, '/')
+            response = Response(mimetype=mimetype)
+            response.headers['X-Accel-Redirect'] = f"{DOCS_ACCEL_PREFIX.rstrip('/')}/{quote(relative)}"
+            response.cache_control.public = True
+            response.cache_control.max_age = DOCUMENT_MAX_AGE
+            _prefetch(file_path)
+            return _pdf_headers(response, file_path) if is_pdf else response
+
+        # send_file does the only stat; conditional answers If-None-Match /
+        # If-Modified-Since with 304 and advertises Range support, letting PDF
+        # viewers fetch the first pages early
+        try:
+            response = send_file(
+                file_path,
+                mimetype=mimetype,
+                conditional=True,
+                max_age=DOCUMENT_MAX_AGE
+            )
+        except OSError:
+            logger.warning("File not found: %s", file_path)
+            abort(404)
+        if response.status_code == 200:
+            _prefetch(file_path)
+
+        return _pdf_headers(response, file_path) if is_pdf else response
+
+    return bp
+
+
+def _prefetch(file_path: str):
+    """Ask the kernel to start reading the whole file into the page cache
+    before the body is sent. WILLNEED outlives the descriptor (it acts on the
+    page cache), unlike FADV_SEQUENTIAL, which only tunes readahead for the
+    descriptor it is set on and so would be lost on close here."""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def _pdf_headers(response: Response, file_path: str) -> Response:
+    # Set proper headers for PDF viewing
+    response.headers['Content-Disposition'] = f'inline; filename="{os.path.basename(file_path)}"'
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    response.headers['X-Frame-Options'] = 'SAMEORIGIN'
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    return response
@@ -0,0 +1,28 @@
+# gunicorn.conf.py
+# Production server settings for the Flask apps:
+#   gunicorn -c gunicorn.conf.py app:app
+#   gunicorn -c gunicorn.conf.py a:app
+import os
+
+bind = os.environ.get("CAMPUSQUERY_BIND", "0.0.0.0:5000")
+
+# One process by default: the query cache, job registry and background init
+# thread live in process memory. Extra workers warm-start from the saved
+# index, which is memory-mapped, so its pages are shared between them.
+# With more than one, a's /api/result polls can reach a worker that doesn't
+# hold the job; the page then falls back to a plain synchronous query.
+workers = int(os.environ.get("CAMPUSQUERY_WORKERS", "1"))
+
+# Not preloaded: importing either app starts the init thread (and app.py's
+# query micro-batcher thread), and threads don't survive the fork into
+# workers. Sharing comes from the mmap'd index instead of copy-on-write.
+preload_app = False
+
+# Queries spend almost all their time waiting on Gemini over the network.
+# Threads release the GIL during that I/O, so one process keeps many
+# queries in flight instead of one per dev-server request.
+worker_class = "gthread"
+threads = int(os.environ.get("CAMPUSQUERY_THREADS", "8"))
+
+# Answer + detailed answer generation, with retries, can exceed the 30s default
+timeout = 120
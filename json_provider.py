@@ -0,0 +1,51 @@
+# json_provider.py
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    orjson walks the object in C and writes bytes directly, which matters for
+    the large query payloads (answers, sources, previews). Types orjson does
+    not know fall back to Flask's default conversions.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            # Callers asking for stdlib options (indent, sort_keys, ...)
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS).decode('utf-8')
+
+    def dumps_bytes(self, obj) -> bytes:
+        return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS)
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS),
+            mimetype=self.mimetype
+        )
+
+
+def dumps_bytes(app, obj) -> bytes:
+    """UTF-8 JSON for ``obj`` using ``app``'s provider, for hand-built bodies
+    such as SSE events; with orjson this skips the str round trip."""
+    if isinstance(app.json, ORJSONProvider):
+        return app.json.dumps_bytes(obj)
+    return app.json.dumps(obj).encode('utf-8')
+
+
+def use_orjson(app):
+    """Switch ``app``'s jsonify/get_json to orjson when it is installed."""
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
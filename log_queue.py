@@ -0,0 +1,47 @@
+# log_queue.py
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+# Optional log file, written by the listener thread alongside the console
+LOG_FILE = os.environ.get("CAMPUSQUERY_LOG_FILE")
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUPS = 5
+
+
+class _InProcessQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener runs in this process, so the record can be handed over
+        # as is and formatted there instead of on the logging thread
+        return record
+
+
+def use_queue_logging() -> Optional[QueueListener]:
+    """Put the root logger's handlers behind a queue drained by a background
+    thread, so log calls only enqueue the record and formatting and writes
+    happen off the request path. Call after logging is configured."""
+    root = logging.getLogger()
+    if any(isinstance(h, QueueHandler) for h in root.handlers):
+        return None
+    if not root.handlers:
+        logging.basicConfig()
+
+    handlers = root.handlers[:]
+    for handler in handlers:
+        root.removeHandler(handler)
+    if LOG_FILE:
+        file_handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_FILE_MAX_BYTES,
+                                           backupCount=LOG_FILE_BACKUPS, encoding="utf-8")
+        file_handler.setFormatter(handlers[0].formatter)
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(_InProcessQueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    # Flushes whatever is still queued on shutdown
+    atexit.register(listener.stop)
+    return listener
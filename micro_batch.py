@@ -0,0 +1,71 @@
+# micro_batch.py
+import queue
+import threading
+import time
+import logging
+from typing import Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Slot:
+    __slots__ = ("item", "done", "result", "error")
+
+    def __init__(self, item: Any):
+        self.item = item
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-item calls into one batched call.
+
+    Callers block in ``submit``; a worker thread takes the first waiting item,
+    collects whatever else arrives within ``max_wait_ms`` (up to ``max_batch``
+    items) and passes them all to ``batch_fn``, which must return one result per
+    item, in order. A lone caller pays at most ``max_wait_ms`` extra.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]],
+                 max_batch: int = 16, max_wait_ms: float = 10, name: str = "micro-batch"):
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[_Slot]" = queue.Queue()
+        threading.Thread(target=self._run, name=name, daemon=True).start()
+
+    def submit(self, item: Any) -> Any:
+        slot = _Slot(item)
+        self._queue.put(slot)
+        slot.done.wait()
+        if slot.error is not None:
+            raise slot.error
+        return slot.result
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                results = self.batch_fn([slot.item for slot in batch])
+                # zip would leave the callers past a short result with None
+                if len(results) != len(batch):
+                    raise ValueError(f"batch_fn returned {len(results)} results for {len(batch)} items")
+                for slot, result in zip(batch, results):
+                    slot.result = result
+            except Exception as e:
+                logger.warning("Batch of %d failed: %s", len(batch), e)
+                for slot in batch:
+                    slot.error = e
+            for slot in batch:
+                slot.done.set()
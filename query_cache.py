@@ -0,0 +1,163 @@
+# query_cache.py
+import os
+import pickle
+import tempfile
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCache:
+    """Two-tier response cache: exact match on the normalised query text, then
+    nearest previously-answered query by embedding (cosine >= threshold).
+
+    The semantic tier is only enabled when an ``embed_fn`` is given; it must
+    return an L2-normalised float32 array of shape (1, d). With ``ttl`` set,
+    entries older than that many seconds are treated as misses.
+    """
+
+    def __init__(self, maxsize: int = 512,
+                 embed_fn: Optional[Callable[[str], np.ndarray]] = None,
+                 threshold: float = 0.97, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._stored_at: Dict[str, float] = {}
+        self._ids: Dict[str, int] = {}
+        self._keys_by_id: Dict[int, str] = {}
+        self._next_id = 0
+        self._index = None
+        self._lock = threading.Lock()
+        if embed_fn is not None:
+            # Imported lazily so exact-only caches don't pull in faiss
+            import faiss
+            self._faiss = faiss
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def lookup(self, query: str) -> Tuple[Optional[Any], Optional[np.ndarray]]:
+        """Return ``(cached_value, query_vector)``.
+
+        ``query_vector`` is the embedding computed for the semantic lookup (or
+        None) so callers can reuse it for retrieval on a miss.
+        """
+        key = self.normalize(query)
+        with self._lock:
+            if key in self._entries and not self._expired(key):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key], None
+
+        if self.embed_fn is None:
+            with self._lock:
+                self.misses += 1
+            return None, None
+
+        try:
+            vector = self.embed_fn(query)
+        except Exception as e:
+            logger.warning("Query embedding failed, skipping semantic cache: %s", e)
+            with self._lock:
+                self.misses += 1
+            return None, None
+
+        with self._lock:
+            if self._index is not None and self._index.ntotal:
+                scores, ids = self._index.search(vector, 1)
+                if ids[0][0] >= 0 and scores[0][0] >= self.threshold:
+                    match = self._keys_by_id[int(ids[0][0])]
+                    if not self._expired(match):
+                        self._entries.move_to_end(match)
+                        self.hits += 1
+                        return self._entries[match], vector
+            self.misses += 1
+        return None, vector
+
+    def store(self, query: str, value: Any, vector: Optional[np.ndarray] = None,
+              stored_at: Optional[float] = None):
+        key = self.normalize(query)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._stored_at[key] = stored_at if stored_at is not None else time.time()
+            if vector is not None and self.embed_fn is not None and key not in self._ids:
+                if self._index is None:
+                    self._index = self._faiss.IndexIDMap2(self._faiss.IndexFlatIP(vector.shape[1]))
+                self._index.add_with_ids(vector, np.array([self._next_id], dtype='int64'))
+                self._ids[key] = self._next_id
+                self._keys_by_id[self._next_id] = key
+                self._next_id += 1
+            while len(self._entries) > self.maxsize:
+                evicted, _ = self._entries.popitem(last=False)
+                self._forget(evicted)
+
+    def _expired(self, key: str) -> bool:
+        """Drop ``key`` and return True if it has outlived the TTL. Caller holds the lock."""
+        if self.ttl is None or time.time() - self._stored_at[key] <= self.ttl:
+            return False
+        del self._entries[key]
+        self._forget(key)
+        return True
+
+    def _forget(self, key: str):
+        self._stored_at.pop(key, None)
+        vector_id = self._ids.pop(key, None)
+        if vector_id is not None:
+            del self._keys_by_id[vector_id]
+            self._index.remove_ids(np.array([vector_id], dtype='int64'))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stored_at.clear()
+            self._ids.clear()
+            self._keys_by_id.clear()
+            self._index = None
+
+    def save(self, path: str):
+        """Pickle the entries, oldest first, with their vectors and timestamps.
+        Written to a unique temp file and renamed into place, so a crash or a
+        concurrent save never leaves a truncated file for ``load``."""
+        with self._lock:
+            rows = [
+                (key, value, self._stored_at[key],
+                 self._index.reconstruct(self._ids[key]) if key in self._ids else None)
+                for key, value in self._entries.items()
+            ]
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(rows, f)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def load(self, path: str) -> int:
+        """Add the entries written by ``save``; returns how many were loaded."""
+        if not os.path.exists(path):
+            return 0
+        with open(path, 'rb') as f:
+            rows = pickle.load(f)
+        for key, value, stored_at, vector in rows:
+            if vector is not None:
+                vector = vector.reshape(1, -1)
+            self.store(key, value, vector, stored_at=stored_at)
+        return len(rows)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,3 +1,5 @@
+const HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
+
 class CampusQueryApp {
     constructor() {
         this.currentQuery = '';
@@ -7,9 +9,12 @@ class CampusQueryApp {
         this.selectedText = '';
         this.currentPdfUrl = '';
         this.currentDocumentName = '';
+        this.queryInFlight = false;
         
         // PDF.js variables
         this.pdfDoc = null;
+        // URL pdfDoc was loaded from; kept across closes so reopening it skips the fetch and parse
+        this.pdfDocUrl = '';
         this.pageNum = 1;
         this.scale = 1.0;
         this.pageRendering = false;
@@ -288,7 +293,6 @@ class CampusQueryApp {
 
     cleanupModal() {
         this.selectedText = '';
-        this.pdfDoc = null;
         this.currentPdfUrl = '';
         this.currentDocumentName = '';
     }
@@ -316,7 +320,8 @@ class CampusQueryApp {
         const askButton = this.$('#askButton');
 
         try {
-            const res = await fetch('/api/status');
+            // Long-polls until initialization finishes (202 = still running)
+            const res = await fetch('/api/wait_ready');
             if (!res.ok) throw new Error('HTTP ' + res.status);
             const data = await res.json();
             
@@ -343,15 +348,43 @@ class CampusQueryApp {
                 if (text) text.textContent = 'Loading…';
                 if (sub) sub.textContent = data.status || 'Initializing…';
                 if (askButton) askButton.disabled = true;
-                setTimeout(() => this.checkStatus(), 1500);
+                if (res.status === 202) {
+                    this.statusRetryDelay = 0;
+                    // Set when the server had no waiting slot free and answered at once
+                    const retryAfter = Number(res.headers.get('Retry-After')) || 0;
+                    setTimeout(() => this.whenVisible(() => this.checkStatus()), retryAfter * 1000);
+                } else {
+                    // Initialization ended without becoming ready
+                    this.retryStatus();
+                }
             }
 
         } catch (e) {
             if (dot) dot.style.background = 'var(--danger)';
             if (text) text.textContent = 'Error';
             if (sub) sub.textContent = 'Connection failed - retrying...';
-            setTimeout(() => this.checkStatus(), 2500);
+            this.retryStatus();
+        }
+    }
+
+    // Back off from 1.5s up to 30s between failed status checks
+    retryStatus() {
+        this.statusRetryDelay = Math.min(Math.max((this.statusRetryDelay || 0) * 1.5, 1500), 30000);
+        setTimeout(() => this.whenVisible(() => this.checkStatus()), this.statusRetryDelay);
+    }
+
+    // Run fn now, or once the tab is visible again, so hidden tabs don't poll
+    whenVisible(fn) {
+        if (!document.hidden) {
+            fn();
+            return;
         }
+        const onChange = () => {
+            if (document.hidden) return;
+            document.removeEventListener('visibilitychange', onChange);
+            fn();
+        };
+        document.addEventListener('visibilitychange', onChange);
     }
 
     updateIndexSection() {
@@ -404,35 +437,56 @@ class CampusQueryApp {
                 <span>${message}</span>
             </div>
         `;
-        wrap.appendChild(node);
-        
+        if (timeout !== 3000) node.style.animationDelay = `0s, ${timeout}ms`;
+        // The stylesheet's toastOut animation hides it; no timers needed
+        node.addEventListener('animationend', (e) => {
+            if (e.animationName === 'toastOut') node.remove();
+        });
         node.addEventListener('click', () => node.remove());
-        
-        setTimeout(() => {
-            if (node.parentNode) {
-                node.style.opacity = '0';
-                node.style.transform = 'translateX(100%)';
-                setTimeout(() => node.remove(), 300);
-            }
-        }, timeout);
+        wrap.appendChild(node);
     }
 
     showAlert(message, type = 'warn') { 
         this.toast(message, type); 
     }
 
+    // One pass over the lines: "- " lines become list items grouped in a
+    // <ul>, other lines are joined with <br>. Runs on every streamed token,
+    // and the text is escaped so model output can't inject markup
     formatText(text = '') {
-        let t = (text || '').replace(/\*\*(.*?)\*\*/g, '<strong>$1</strong>');
-        t = t.replace(/\n/g, '<br>'); 
-        t = t.replace(/^- (.+)$/gm, '<li>$1</li>');
-        t = t.replace(/(<li>.*<\/li>)/s, '<ul>$1</ul>');
-        return t; 
+        const out = [];
+        let inList = false;
+        for (const line of (text || '').split('\n')) {
+            const item = line.startsWith('- ');
+            if (item !== inList) {
+                out.push(item ? '<ul>' : '</ul>');
+                inList = item;
+            } else if (out.length && !item) {
+                out.push('<br>');
+            }
+            out.push(item ? `<li>${this.formatInline(line.slice(2))}</li>` : this.formatInline(line));
+        }
+        if (inList) out.push('</ul>');
+        return out.join('');
     }
 
-    stripHTML(html = '') { 
-        const tmp = document.createElement('div'); 
-        tmp.innerHTML = html; 
-        return tmp.textContent || tmp.innerText || ''; 
+    // **bold** spans of one line, found with indexOf instead of a backtracking regex
+    formatInline(line) {
+        let html = '';
+        let i = 0;
+        while (i < line.length) {
+            const open = line.indexOf('**', i);
+            const close = open < 0 ? -1 : line.indexOf('**', open + 2);
+            if (close < 0) break;
+            html += this.escapeHtml(line.slice(i, open)) +
+                `<strong>${this.escapeHtml(line.slice(open + 2, close))}</strong>`;
+            i = close + 2;
+        }
+        return html + this.escapeHtml(line.slice(i));
+    }
+
+    escapeHtml(text) {
+        return text.replace(/[&<>"']/g, (c) => HTML_ESCAPES[c]);
     }
 
     /* Core actions */
@@ -471,6 +525,13 @@ class CampusQueryApp {
             return;
         }
 
+        // Enter, the sample chips and PDF follow-ups can all submit while a query runs
+        if (this.queryInFlight) {
+            this.toast('Still answering the previous question…', 'info');
+            return;
+        }
+        this.queryInFlight = true;
+
         this.currentQuery = q;
         this.showLoading('Processing your query…');
         const askBtn = this.$('#askButton');
@@ -482,20 +543,25 @@ class CampusQueryApp {
 
         try {
             const startTime = Date.now();
-            const res = await fetch('/api/query', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ query: q })
-            });
-            
-            const data = await res.json();
-            if (!res.ok) {
-                throw new Error(data.error || 'Query failed');
-            }
+            let shownEarly = false;
+            const data = window.EventSource
+                ? await this.streamQuery(q, (partial) => {
+                    this.hideLoading();
+                    partial.detailed_answer = 'Generating the detailed explanation…';
+                    this.currentResult = partial;
+                    this.displayResults(partial);
+                    shownEarly = true;
+                })
+                : await this.fetchQuery(q);
 
             const processingTime = ((Date.now() - startTime) / 1000).toFixed(1);
             this.currentResult = data;
-            this.displayResults(data);
+            // Already scrolled to when the early answer was shown; the reader may have moved on
+            this.displayResults(data, !shownEarly);
+            const detailContent = this.$('#detailContent');
+            if (this.detailVisible && detailContent) {
+                detailContent.innerHTML = this.formatText(data.detailed_answer);
+            }
             
             if (data.answer.includes('🌐 **Information from Web Search:**')) {
                 this.toast(`Web search completed in ${processingTime}s`, 'info');
@@ -506,6 +572,7 @@ class CampusQueryApp {
         } catch (err) {
             this.showAlert('Error: ' + err.message, 'error');
         } finally {
+            this.queryInFlight = false;
             this.hideLoading();
             if (askBtn) {
                 askBtn.disabled = false;
@@ -514,9 +581,80 @@ class CampusQueryApp {
         }
     }
 
+    async fetchQuery(q) {
+        const res = await fetch('/api/query', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ query: q })
+        });
+
+        const data = await res.json();
+        if (!res.ok) {
+            throw new Error(data.error || 'Query failed');
+        }
+        return data;
+    }
+
+    // Render the answer as it is generated; resolves with the final /api/query-shaped result
+    streamQuery(q, onAnswer) {
+        return new Promise((resolve, reject) => {
+            const source = new EventSource(`/api/query_stream?query=${encodeURIComponent(q)}`);
+            const answerContent = this.$('#answerContent');
+            let answer = '';
+            // Tokens arrive faster than the screen refreshes; re-format the
+            // whole answer at most once per frame instead of once per token
+            let renderFrame = null;
+            const stopRendering = () => {
+                if (renderFrame) cancelAnimationFrame(renderFrame);
+                renderFrame = null;
+            };
+
+            source.addEventListener('sources', (e) => {
+                const names = JSON.parse(e.data);
+                if (!answer) this.showLoading(`Reading ${names.length} sources: ${[...new Set(names)].join(', ')}`);
+            });
+            source.addEventListener('token', (e) => {
+                if (!answer) {
+                    this.hideLoading();
+                    const resCard = this.$('#resultsSection');
+                    if (resCard) resCard.classList.remove('hidden');
+                }
+                answer += JSON.parse(e.data);
+                if (answerContent && !renderFrame) {
+                    renderFrame = requestAnimationFrame(() => {
+                        renderFrame = null;
+                        answerContent.innerHTML = this.formatText(answer);
+                    });
+                }
+            });
+            // Answer and sources, sent while the detailed explanation is still
+            // being written; it renders the full answer, so drop any pending
+            // token frame rather than let it overwrite the result card
+            source.addEventListener('answer', (e) => {
+                stopRendering();
+                if (onAnswer) onAnswer(JSON.parse(e.data));
+            });
+            source.addEventListener('result', (e) => {
+                stopRendering();
+                source.close();
+                resolve(JSON.parse(e.data));
+            });
+            source.addEventListener('failure', (e) => {
+                stopRendering();
+                source.close();
+                reject(new Error(JSON.parse(e.data).error || 'Query failed'));
+            });
+            source.onerror = () => {
+                stopRendering();
+                source.close();
+                reject(new Error('Query failed'));
+            };
+        });
+    }
+
     // Find the displayResults method in your existing app.js and REPLACE it with this enhanced version
 
-displayResults(data) {
+displayResults(data, scroll = true) {
     const resCard = this.$('#resultsSection');
     if (resCard) resCard.classList.remove('hidden');
     
@@ -793,11 +931,21 @@ displayResults(data) {
         });
     }
 
-    if (resCard) {
-        resCard.scrollIntoView({ behavior: 'smooth', block: 'start' });
+    if (resCard && scroll) {
+        this.scrollIntoViewSoon(resCard);
     }
 }
 
+    // Scroll once the browser lays out the new content, instead of forcing a
+    // layout right after the DOM writes; a newer call replaces a pending one
+    scrollIntoViewSoon(el, block = 'start') {
+        if (this.scrollFrame) cancelAnimationFrame(this.scrollFrame);
+        this.scrollFrame = requestAnimationFrame(() => {
+            this.scrollFrame = null;
+            el.scrollIntoView({ behavior: 'smooth', block });
+        });
+    }
+
     /* MAIN FEATURE: Accurate PDF Viewer with Pixel-Perfect Text Highlighting */
     openAccuratePDFViewer(source) {
         const modal = this.$('#snippetModal');
@@ -915,8 +1063,21 @@ displayResults(data) {
                 await this.loadPDFJSPromise();
             }
 
-            const loadingTask = pdfjsLib.getDocument(this.currentPdfUrl);
-            this.pdfDoc = await loadingTask.promise;
+            if (!this.pdfDoc || this.pdfDocUrl !== this.currentPdfUrl) {
+                if (this.pdfDoc) {
+                    this.pdfDoc.destroy();
+                    this.pdfDoc = null;
+                }
+                const url = this.currentPdfUrl;
+                const pdfDoc = await pdfjsLib.getDocument(url).promise;
+                if (url !== this.currentPdfUrl) {
+                    // Closed, or another document opened, while this one loaded
+                    pdfDoc.destroy();
+                    return;
+                }
+                this.pdfDoc = pdfDoc;
+                this.pdfDocUrl = url;
+            }
             
             const loadingMessage = document.getElementById('loadingMessage');
             if (loadingMessage) {
@@ -1267,7 +1428,7 @@ displayResults(data) {
             }
             btn.innerHTML = '<span>📖</span> Hide Details';
             this.detailVisible = true;
-            setTimeout(() => card.scrollIntoView({ behavior: 'smooth', block: 'start' }), 100);
+            this.scrollIntoViewSoon(card);
         }
     }
 
@@ -1290,10 +1451,10 @@ QUESTION:
 ${this.currentQuery}
 
 ANSWER:
-${this.stripHTML(this.currentResult.answer)}
+${this.currentResult.answer || ''}
 
 DETAILED EXPLANATION:
-${this.stripHTML(this.currentResult.detailed_answer)}
+${this.currentResult.detailed_answer || ''}
 
 SOURCES:
 ${data.sources.map(source => `- ${source}`).join('\n')}
@@ -1324,7 +1485,8 @@ Generated by CampusQuery Enhanced - University Information Assistant
             return;
         }
 
-        const text = this.stripHTML(this.currentResult.answer);
+        // The server sends plain text; only formatText turns it into markup
+        const text = this.currentResult.answer || '';
         navigator.clipboard.writeText(text).then(() => {
             this.toast('Answer copied to clipboard!', 'success');
         }).catch(() => {
@@ -1345,7 +1507,7 @@ Generated by CampusQuery Enhanced - University Information Assistant
         this.showLoading('Rebuilding document index...');
         
         try {
-            const res = await fetch('/api/rebuild');
+            const res = await fetch('/api/rebuild', { method: 'POST' });
             const data = await res.json();
             if (!res.ok) throw new Error(data.error);
             
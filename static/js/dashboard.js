@@ -1,3 +1,10 @@
+// The fade-in cards only animate once; release their compositor layers
+document.addEventListener("animationend", (e) => {
+  if (e.target.classList.contains("fade-in")) {
+    e.target.style.willChange = "auto";
+  }
+});
+
 document.addEventListener("DOMContentLoaded", () => {
   const enterBtn = document.getElementById("enterAssistantBtn");
 
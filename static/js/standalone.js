@@ -0,0 +1,353 @@
+// The page's fixed elements, looked up once; the script runs after the markup
+const els = {
+    statusText: document.getElementById('statusText'),
+    docCount: document.getElementById('docCount'),
+    queryCount: document.getElementById('queryCount'),
+    successRate: document.getElementById('successRate'),
+    statusIndicator: document.getElementById('statusIndicator'),
+    askBtn: document.getElementById('askBtn'),
+    queryInput: document.getElementById('queryInput'),
+    resultContainer: document.getElementById('resultContainer'),
+    modalTitle: document.getElementById('modalTitle'),
+    modalBody: document.getElementById('modalBody'),
+    pdfModal: document.getElementById('pdfModal'),
+    samplePanel: document.getElementById('samplePanel'),
+};
+
+let systemReady = false;
+// Set while a query runs; sample, related-question and Ctrl+Enter submits are ignored meanwhile
+let queryInFlight = false;
+// Sources and follow-ups of the displayed answer; their buttons refer to them by index
+let currentSources = [];
+let currentFollowUps = [];
+
+function updateStatus(data) {
+    console.log('[Status Response]', data);
+
+    els.statusText.textContent = data.status;
+    els.docCount.textContent = data.document_count || 0;
+    els.queryCount.textContent = data.query_count || 0;
+    els.successRate.textContent = (data.success_rate || 0).toFixed(1) + '%';
+
+    const indicator = els.statusIndicator;
+    const askBtn = els.askBtn;
+
+    // Check if ready
+    if (data.ready && data.document_count > 0) {
+        systemReady = true;
+        indicator.classList.add('ready');
+        askBtn.disabled = false;
+        console.log('✓ SYSTEM READY - Button enabled!');
+    } else {
+        systemReady = false;
+        indicator.classList.remove('ready');
+        askBtn.disabled = true;
+        console.log('System not ready, waiting for next status...');
+    }
+}
+
+function fetchStatus(url, onRetryAfter) {
+    return fetch(url).then(r => {
+        if (!r.ok) throw new Error(`HTTP ${r.status}`);
+        if (onRetryAfter) onRetryAfter(Number(r.headers.get('Retry-After')) || 0);
+        return r.json();
+    });
+}
+
+// Refresh the status panel once (e.g. after a query)
+function checkStatus() {
+    fetchStatus('/api/status')
+        .then(updateStatus)
+        .catch(error => {
+            console.error('[Status Error]', error);
+        });
+}
+
+// Run fn now, or once the tab is visible again, so hidden tabs don't poll
+function whenVisible(fn) {
+    if (!document.hidden) {
+        fn();
+        return;
+    }
+    document.addEventListener('visibilitychange', function onChange() {
+        if (document.hidden) return;
+        document.removeEventListener('visibilitychange', onChange);
+        fn();
+    });
+}
+
+let statusRetryDelay = 0;
+
+// Until ready, hold one request open that the server answers on each status change
+function watchStatus(version) {
+    const url = version === undefined ? '/api/status' : `/api/status?version=${version}`;
+    // Set when the server had no long-poll slot free and answered at once
+    let retryAfter = 0;
+    fetchStatus(url, seconds => { retryAfter = seconds; })
+        .then(data => {
+            statusRetryDelay = 0;
+            updateStatus(data);
+            // Once initialization has ended (e.g. failed) the status won't change again
+            if (!systemReady && data.initializing) {
+                setTimeout(() => whenVisible(() => watchStatus(data.version)), retryAfter * 1000);
+            }
+        })
+        .catch(error => {
+            console.error('[Status Error]', error);
+            // Back off from 1.5s up to 30s while the server is unreachable
+            statusRetryDelay = Math.min(Math.max(statusRetryDelay * 1.5, 1500), 30000);
+            setTimeout(() => whenVisible(() => watchStatus(version)), statusRetryDelay);
+        });
+}
+
+function askSampleQuestion(text) {
+    if (queryInFlight) return;
+    els.queryInput.value = text;
+    processQuery();
+}
+
+function clearQuery() {
+    els.queryInput.value = '';
+    const result = els.resultContainer;
+    if (result) result.style.display = 'none';
+}
+
+function processQuery() {
+    if (!systemReady) {
+        alert('⏳ System is still initializing. Please wait a moment...');
+        return;
+    }
+
+    const query = els.queryInput.value.trim();
+    if (!query) {
+        alert('Please enter a question');
+        return;
+    }
+
+    if (queryInFlight) return;
+    queryInFlight = true;
+
+    const askBtn = els.askBtn;
+    const resultContainer = els.resultContainer;
+
+    askBtn.disabled = true;
+    askBtn.textContent = 'Processing...';
+
+    resultContainer.innerHTML = '<div class="loading"><div class="spinner"></div><p style="font-size: 1.2rem;">Analyzing your question with AI...</p></div>';
+    resultContainer.style.display = 'block';
+    // Showing it restarts the slide-in, so let the stylesheet's will-change apply again
+    resultContainer.style.willChange = '';
+
+    // Scroll to results after the spinner is laid out, not in the middle of the DOM writes
+    requestAnimationFrame(() => resultContainer.scrollIntoView({ behavior: 'smooth' }));
+
+    console.log('[Query] Sending:', query);
+
+    fetch('/api/query', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ query: query, async: true })
+    })
+    .then(r => {
+        if (!r.ok) throw new Error(`HTTP ${r.status}`);
+        return r.json();
+    })
+    .then(job => job.job_id ? waitForResult(job.job_id, query) : job)
+    .then(data => {
+        console.log('[Answer] Received');
+        if (data.error) {
+            showError(data.error);
+        } else {
+            displayResults(data);
+        }
+        checkStatus(); // Refresh status
+    })
+    .catch(error => {
+        console.error('[Query Error]', error);
+        showError('Network error: ' + error.message);
+    })
+    .finally(() => {
+        queryInFlight = false;
+        askBtn.disabled = !systemReady;
+        askBtn.textContent = 'Ask Question';
+    });
+}
+
+// Poll a submitted query until the server has the answer. Jobs live in one
+// server process, so with several workers a poll can reach one that never
+// saw the job (404); then ask again and wait on that request instead
+function waitForResult(jobId, query) {
+    return fetch(`/api/result/${jobId}`).then(r => {
+        if (r.status === 202) {
+            return new Promise(resolve => setTimeout(resolve, 500))
+                .then(() => waitForResult(jobId, query));
+        }
+        if (r.status === 404) {
+            return fetch('/api/query', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ query: query })
+            }).then(res => res.json());
+        }
+        return r.json();
+    });
+}
+
+function displayResults(data) {
+    let html = `
+        <div class="result-header">
+            <h2 class="result-title">Answer</h2>
+            <div class="metrics">
+                <div class="metric">
+                    <span style="color: #16a34a;">✓</span>
+                    <span>Confidence: <strong>${(data.confidence_score * 100).toFixed(1)}%</strong></span>
+                </div>
+                <div class="metric">
+                    <span style="color: #2563eb;">📊</span>
+                    <span>Quality: <strong>${(data.quality_score * 100).toFixed(1)}%</strong></span>
+                </div>
+                <div class="metric">
+                    <span style="color: #7c3aed;">⏱️</span>
+                    <span>Time: <strong>${data.processing_time.toFixed(2)}s</strong></span>
+                </div>
+            </div>
+        </div>
+
+        <div class="answer-content">${escapeHtml(data.answer).replace(/\n/g, '<br>')}</div>
+    `;
+
+    if (data.key_points && data.key_points.length > 0) {
+        html += '<div class="key-points"><h3>📌 Key Points</h3><ul>';
+        data.key_points.forEach(point => {
+            html += `<li>${escapeHtml(point)}</li>`;
+        });
+        html += '</ul></div>';
+    }
+
+    if (data.sources && data.sources.length > 0) {
+        html += '<div class="sources-section">';
+        html += `<h3>📄 Sources & Citations (${data.sources.length})</h3>`;
+        data.sources.forEach((source, i) => {
+            html += `
+                <div class="source-card">
+                    <div class="source-card-header">
+                        <div class="source-filename">${escapeHtml(source.filename)}</div>
+                        <button class="view-pdf-btn" data-idx="${i}">
+                            🔍 View PDF
+                        </button>
+                    </div>
+                    <div style="color: #6b7280; font-size: 14px; margin-bottom: 10px;">
+                        Relevance: <strong style="color: #2563eb;">${(source.relevance_score * 100).toFixed(0)}%</strong>
+                        ${source.page_number ? ` | Page: ${source.page_number}` : ''}
+                    </div>
+                    <div class="citation-box">
+                        <div class="citation-label">📌 Citation from document:</div>
+                        <div>${escapeHtml(source.content_preview.substring(0, 400))}...</div>
+                    </div>
+                </div>
+            `;
+        });
+        html += '</div>';
+    }
+
+    if (data.follow_up_questions && data.follow_up_questions.length > 0) {
+        html += '<div class="followup-section">';
+        html += '<h3>💡 Related Questions</h3>';
+        html += '<div class="followup-grid">';
+        data.follow_up_questions.forEach((q, i) => {
+            html += `<button class="followup-btn" data-idx="${i}">${escapeHtml(q)}</button>`;
+        });
+        html += '</div></div>';
+    }
+
+    currentSources = data.sources || [];
+    currentFollowUps = data.follow_up_questions || [];
+    els.resultContainer.innerHTML = html;
+}
+
+function showError(error) {
+    els.resultContainer.innerHTML = `
+        <div class="error-box">
+            <strong>❌ Error</strong>
+            <div>${escapeHtml(error)}</div>
+        </div>
+    `;
+}
+
+function openPDFViewer(source) {
+    els.modalTitle.textContent = source.filename;
+    els.modalBody.innerHTML = `
+        <div class="highlight-box">
+            <h4>📌 Highlighted Citation:</h4>
+            <p>${escapeHtml(source.content_preview)}</p>
+        </div>
+        <div class="pdf-preview">
+            <svg class="pdf-icon" viewBox="0 0 24 24" fill="none" stroke="currentColor">
+                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z" />
+            </svg>
+            <p style="color: #6b7280; font-size: 1.1rem;">PDF Document: <strong>${escapeHtml(source.filename)}</strong></p>
+            <p style="color: #9ca3af; margin-top: 10px;">The citation above shows the exact text used for this answer</p>
+            <a href="/docs/${encodeURIComponent(source.filename)}" target="_blank" class="open-pdf-btn">
+                📄 Open Full PDF in New Tab
+            </a>
+        </div>
+    `;
+    els.pdfModal.style.display = 'block';
+}
+
+function closePDFModal() {
+    els.pdfModal.style.display = 'none';
+}
+
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
+// One listener each for the sample questions and the result buttons, which
+// are re-rendered with every answer
+els.samplePanel.addEventListener('click', function(e) {
+    const btn = e.target.closest('.sample-btn');
+    if (btn) askSampleQuestion(btn.textContent.trim());
+});
+
+els.resultContainer.addEventListener('click', function(e) {
+    const pdfBtn = e.target.closest('.view-pdf-btn');
+    if (pdfBtn) {
+        openPDFViewer(currentSources[+pdfBtn.dataset.idx]);
+        return;
+    }
+    const followUp = e.target.closest('.followup-btn');
+    if (followUp) askSampleQuestion(currentFollowUps[+followUp.dataset.idx]);
+});
+
+// The result card keeps its compositor layer only for the slide-in
+els.resultContainer.addEventListener('animationend', function(e) {
+    if (e.target === this) this.style.willChange = 'auto';
+});
+
+// Close modal on outside click
+window.onclick = function(event) {
+    const modal = els.pdfModal;
+    if (event.target === modal) {
+        closePDFModal();
+    }
+}
+
+// Keyboard shortcuts
+els.queryInput.addEventListener('keydown', function(e) {
+    if (e.key === 'Enter' && (e.ctrlKey || e.metaKey)) {
+        processQuery();
+    }
+});
+
+document.addEventListener('keydown', function(e) {
+    if (e.key === 'Escape') {
+        closePDFModal();
+    }
+});
+
+// Initialize - follow status until the system is ready
+console.log('=== VIT-AP Assistant Interface Loaded ===');
+watchStatus();